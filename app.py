@@ -1,16 +1,114 @@
 import streamlit as st
-import streamlit.components.v1 as components
-import networkx as nx
-import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+import json
+import os
 from datetime import datetime
-import random
-from io import StringIO
+
+from linkedin_network.connections import (
+    TIMELINE_GRANULARITIES,
+    industry_counts,
+    known_companies,
+    known_company_counts,
+    new_company_counts,
+    oldest_connections,
+    stale_connections,
+    with_dates,
+)
+from linkedin_network.delta import update_network
+from linkedin_network.export import EXPORT_FORMATS, export_bytes, statistics_json
+from linkedin_network.filters import ALL, EMAIL_FILTERS
+from linkedin_network.instrumentation import NULL_RECORDER, StageRecorder
+from linkedin_network.ingest import (
+    EXPECTED_COLUMNS,
+    MissingColumnsError,
+    build_graph,
+    content_digest,
+    load_network,
+)
+from linkedin_network.layout import (
+    DEFAULT_LAYOUT,
+    LAYOUT_ALGORITHMS,
+    MAX_NETWORKX_LAYOUT_NODES,
+    SCALABLE_ALGORITHMS,
+    LayoutCache,
+    company_overview_positions,
+    compute_layout,
+    force_directed_positions,
+)
+from linkedin_network.merge import merge_networks, owner_labels
+from linkedin_network.metrics import graph_metrics, induced_subgraph
+from linkedin_network.render import (
+    COMPANY_POINT,
+    PERSON_POINT,
+    build_bar_figure,
+    build_merged_figure,
+    build_network_figure,
+    build_overview_figure,
+    build_pie_figure,
+)
+from linkedin_network.sampling import SAMPLE_SEED
+from linkedin_network.snapshot import SnapshotError, has_snapshot, list_snapshots, load_snapshot, save_snapshot
+
+# Number of distinct uploads whose parsed data is kept in memory
+INGEST_CACHE_ENTRIES = 4
+# Number of graph layouts kept for reuse and warm starts
+LAYOUT_CACHE_ENTRIES = 16
+# Reruns whose stage timings are kept for the Performance panel's download
+PERFORMANCE_HISTORY = 20
+# Saved networks are listed only to the session that uploaded or saved them. On a
+# single-user machine, set this variable to 1 to list every snapshot on disk
+LIST_ALL_SNAPSHOTS = os.environ.get("LINKEDIN_NETWORK_LIST_ALL_SNAPSHOTS") == "1"
 
 # Set page configuration
 st.set_page_config(page_title="LinkedIn Network Visualizer", layout="wide")
 
+
+@st.cache_resource(max_entries=INGEST_CACHE_ENTRIES, show_spinner="Processing your connections...")
+def load_cached_network(digest, _uploaded_file, _recorder=NULL_RECORDER):
+    # Keyed on the content digest only; least recently used uploads are evicted first.
+    # A file saved as a snapshot before is reopened from disk instead of parsed again
+    if has_snapshot(digest):
+        return load_snapshot(digest, layout_cache=get_layout_cache(), recorder=_recorder)
+    return load_network(_uploaded_file, digest=digest, recorder=_recorder)
+
+
+@st.cache_resource(max_entries=INGEST_CACHE_ENTRIES, show_spinner="Opening saved network...")
+def load_cached_snapshot(digest, _recorder=NULL_RECORDER):
+    return load_snapshot(digest, layout_cache=get_layout_cache(), recorder=_recorder)
+
+
+@st.cache_resource(max_entries=INGEST_CACHE_ENTRIES, show_spinner="Updating the saved network...")
+def update_cached_network(digest, base_digest, _uploaded_file, _recorder=NULL_RECORDER):
+    # Opening the saved network also brings back its layouts, which the unchanged node IDs reuse
+    return update_network(load_cached_snapshot(base_digest, _recorder), _uploaded_file, digest=digest,
+                          recorder=_recorder)
+
+
+@st.cache_resource(max_entries=INGEST_CACHE_ENTRIES, show_spinner="Merging networks...")
+def merge_cached_networks(digests, owners, _networks):
+    """Merged network of several uploads, keyed by their content digests."""
+    return merge_networks(_networks, owners)
+
+
+@st.cache_resource(max_entries=INGEST_CACHE_ENTRIES, show_spinner="Analyzing the merged network...")
+def merged_network_metrics(digests, owners, _merged):
+    """``graph_metrics`` of the merged network, computed once per set of uploads."""
+    return graph_metrics(_merged.adjacency)
+
+
+@st.cache_resource(max_entries=INGEST_CACHE_ENTRIES, show_spinner="Laying out the merged network...")
+def merged_network_view(digests, owners, _merged):
+    """Nodes, edges and positions of the merged network graph."""
+    nodes = _merged.view_nodes()
+    sources, targets = _merged.subgraph_edges(nodes)
+    return nodes, sources, targets, force_directed_positions(len(nodes), sources, targets)
+
+
+@st.cache_resource
+def get_layout_cache():
+    return LayoutCache(max_entries=LAYOUT_CACHE_ENTRIES)
+
 # Add Bootstrap CSS
 st.markdown("""
 <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
@@ -120,12 +218,30 @@ st.markdown("""
 # Title and description
 st.title("LinkedIn Network Visualizer")
 
+# Stage timings of this rerun; the switches are drawn in the Performance panel at the end.
+# A rerun cut short by st.rerun never reaches the panel, so its recorder is finished here
+if st.session_state.get('performance_recorder') is not None:
+    st.session_state.performance_recorder.finish()
+perf = StageRecorder(enabled=st.session_state.get("record_performance", False),
+                     trace_memory=st.session_state.get("trace_memory", False))
+st.session_state.performance_recorder = perf
+
 
 # Initialize session state
 if 'selected_node' not in st.session_state:
     st.session_state.selected_node = None
-if 'graph_data' not in st.session_state:
-    st.session_state.graph_data = None
+if 'network' not in st.session_state:
+    st.session_state.network = None
+if 'expanded_companies' not in st.session_state:
+    st.session_state.expanded_companies = set()
+    # Bumped after each handled click so the overview chart starts with an empty selection
+    st.session_state.overview_chart = 0
+    st.session_state.overview_digest = None
+if 'sample_seed' not in st.session_state:
+    st.session_state.sample_seed = SAMPLE_SEED
+if 'snapshot_digests' not in st.session_state:
+    # Digests of the files this session uploaded or saved; only their snapshots are listed
+    st.session_state.snapshot_digests = set()
 
 # File upload section
 st.markdown("""
@@ -148,90 +264,91 @@ st.markdown("""
 
 
 uploaded_file = st.file_uploader("Choose your Connections.csv file", type=['csv'], help="Upload the Connections.csv file from your LinkedIn data download")
-
 if uploaded_file is not None:
+    st.session_state.snapshot_digests.add(content_digest(uploaded_file))
+
+# Networks saved by this session can be reopened without uploading them again,
+# or updated with a newer export of the same network
+snapshot_digest = None
+snapshots = [manifest for manifest in list_snapshots()
+             if LIST_ALL_SNAPSHOTS or manifest["digest"] in st.session_state.snapshot_digests]
+if snapshots:
+    st.sidebar.header("Saved Networks")
+    saved = {manifest["digest"]: manifest for manifest in snapshots}
+    snapshot_digest = st.sidebar.selectbox(
+        "Open a saved network" if uploaded_file is None else "Update a saved network with this upload",
+        [None, *saved],
+        format_func=lambda digest: "None" if digest is None else
+            f"{saved[digest]['name']} ({saved[digest]['connections']} connections, saved {saved[digest]['saved_at']})",
+        help="With an upload, only connections that were added or changed since the saved network are processed"
+    )
+
+if uploaded_file is not None or snapshot_digest is not None:
     try:
-        # Read the CSV file - handle potential encoding issues and special characters
-        df = None
-        
-        # Try reading with UTF-8 encoding first
+        # Parse the upload once per distinct file; reruns reuse the cached result
+        delta = None
         try:
-            uploaded_file.seek(0)
-            content = uploaded_file.read().decode('utf-8')
-            lines = content.split('\n')
-            
-            # Find the header line (first line that starts with "First Name")
-            header_index = 0
-            for i, line in enumerate(lines):
-                if line.startswith('First Name'):
-                    header_index = i
-                    break
-            
-            # Skip to the header and process the CSV
-            csv_content = '\n'.join(lines[header_index:])
-            csv_file = StringIO(csv_content)
-            
-            # Read with specific parameters to handle LinkedIn's format
-            df = pd.read_csv(csv_file, 
-                           encoding='utf-8',
-                           quotechar='"',
-                           escapechar='\\',
-                           doublequote=True,
-                           skipinitialspace=True)
-        except Exception as e1:
-            # Try with Latin-1 encoding
-            try:
-                uploaded_file.seek(0)
-                content = uploaded_file.read().decode('latin-1')
-                lines = content.split('\n')
-                
-                # Find the header line
-                header_index = 0
-                for i, line in enumerate(lines):
-                    if line.startswith('First Name'):
-                        header_index = i
-                        break
-                
-                csv_content = '\n'.join(lines[header_index:])
-                csv_file = StringIO(csv_content)
-                
-                df = pd.read_csv(csv_file, 
-                               encoding='latin-1',
-                               quotechar='"',
-                               escapechar='\\',
-                               doublequote=True,
-                               skipinitialspace=True)
-            except Exception as e2:
-                # Last resort: try with different parameters
-                uploaded_file.seek(0)
-                df = pd.read_csv(uploaded_file, 
-                               encoding='utf-8',
-                               sep=',',
-                               quotechar='"',
-                               on_bad_lines='skip')
-        
-        # Clean column names - LinkedIn files might have leading/trailing spaces
-        df.columns = df.columns.str.strip()
-        
-        # Expected columns
-        expected_columns = ['First Name', 'Last Name', 'URL', 'Email Address', 'Company', 'Position', 'Connected On']
-        
-        # Verify columns
-        missing_columns = [col for col in expected_columns if col not in df.columns]
-        if missing_columns:
-            st.error(f"Missing columns in CSV: {', '.join(missing_columns)}")
-            st.info("Expected columns: " + ", ".join(expected_columns))
-            st.info("Found columns: " + ", ".join(df.columns.tolist()))
+            with perf.stage("load network") as stage:
+                if uploaded_file is not None:
+                    network_name = uploaded_file.name
+                    if snapshot_digest is None:
+                        network = load_cached_network(content_digest(uploaded_file), uploaded_file, perf)
+                    else:
+                        network, delta = update_cached_network(content_digest(uploaded_file), snapshot_digest, uploaded_file,
+                                                                  perf)
+                else:
+                    network_name = saved[snapshot_digest]["name"]
+                    network = load_cached_snapshot(snapshot_digest, perf)
+                stage.rows = len(network.connections)
+        except SnapshotError as e:
+            network = None
+            st.error(str(e))
+        except MissingColumnsError as e:
+            network = None
+            st.error(str(e))
+            st.info("Expected columns: " + ", ".join(EXPECTED_COLUMNS))
+            st.info("Found columns: " + ", ".join(e.found))
             
             # Show first few lines to help debug
             st.markdown("**First few lines of your file:**")
             uploaded_file.seek(0)
             content = uploaded_file.read().decode('utf-8', errors='replace')
             st.text(content[:500])
-        else:
+        
+        if network is not None:
+            df = network.df
+            connections = network.connections
+            
             # Display file info
             st.success(f"Successfully loaded {len(df)} connections!")
             
+            # Report what changed since the saved network this upload updates
+            if delta is not None:
+                with st.expander(f"Changes since {saved[snapshot_digest]['name']} (saved {saved[snapshot_digest]['saved_at']})", expanded=True):
+                    if delta.is_empty:
+                        st.info("No connections were added, removed or changed.")
+                    else:
+                        col1, col2, col3, col4 = st.columns(4)
+                        with col1:
+                            st.metric("Added", len(delta.added))
+                        with col2:
+                            st.metric("Removed", len(delta.removed))
+                        with col3:
+                            st.metric("Changed", delta.changed_count)
+                        with col4:
+                            st.metric("Unchanged", delta.unchanged)
+                        
+                        if not delta.changes.empty:
+                            st.markdown("**Changed fields:** " + ", ".join(
+                                f"{field} ({count})" for field, count in delta.field_counts().items()))
+                            st.dataframe(delta.changes[['name', 'field', 'before', 'after']].head(100), hide_index=True)
+                        if not delta.added.empty:
+                            st.markdown("**Added connections**")
+                            st.dataframe(delta.added[['name', 'title', 'company']].head(100), hide_index=True)
+                        if not delta.removed.empty:
+                            st.markdown("**Removed connections**")
+                            st.dataframe(delta.removed[['name', 'title', 'company']].head(100), hide_index=True)
+            
             # Create a preview of the data
             with st.expander("Preview your connections data"):
                 # Show sample data with sensitive info masked
@@ -254,92 +371,14 @@ if uploaded_file is not None:
                     st.markdown(f"- **With URL**: {len(df[df['URL'].notna()])}")
                     st.markdown(f"- **With Connected Date**: {len(df[df['Connected On'].notna()])}")
             
-            # Process the data
-            connections = []
-            
-            # Create main person data (the user)
-            main_person_data = {
-                "name": "You",
-                "type": "main",
-                "title": "Your Title",
-                "company": "Your Company",
-                "location": "Your Location",
-                "email": "your.email@company.com",
-                "experience": "Your experience",
-                "education": "Your education",
-                "skills": ["Your", "Skills"],
-                "connected_on": None,
-                "url": None
-            }
-            
-            # Process each connection
-            for idx, row in df.iterrows():
-                # Extract data from CSV columns
-                first_name = str(row['First Name']).strip() if pd.notna(row['First Name']) else ""
-                last_name = str(row['Last Name']).strip() if pd.notna(row['Last Name']) else ""
-                url = str(row['URL']).strip() if pd.notna(row['URL']) else ""
-                email = str(row['Email Address']).strip() if pd.notna(row['Email Address']) else ""
-                company = str(row['Company']).strip() if pd.notna(row['Company']) else "Unknown Company"
-                position = str(row['Position']).strip() if pd.notna(row['Position']) else "Professional"
-                connected_on = str(row['Connected On']).strip() if pd.notna(row['Connected On']) else ""
-                
-                # Skip empty names
-                if not first_name and not last_name:
-                    continue
-                
-                # Create full name
-                full_name = f"{first_name} {last_name}".strip()
-                
-                # Convert Connected On to standard format
-                connected_date_formatted = ""
-                if connected_on:
-                    try:
-                        # Parse LinkedIn's format "27 Aug 2010"
-                        date_obj = datetime.strptime(connected_on, '%d %b %Y')
-                        connected_date_formatted = date_obj.strftime('%B %d, %Y')
-                    except ValueError:
-                        # If parsing fails, keep original
-                        connected_date_formatted = connected_on
-                
-                # Create connection data
-                connection_data = {
-                    "name": full_name,
-                    "type": "connection",
-                    "title": position,
-                    "company": company,
-                    "location": "Location not available",
-                    "email": email,
-                    "experience": f"Works at {company}",
-                    "education": "Education not available",
-                    "skills": ["Professional Networking"],
-                    "connected_on": connected_date_formatted,
-                    "url": url,
-                    "raw_connected_on": connected_on  # Keep raw format for sorting
-                }
-                connections.append(connection_data)
-            
-            # Create the network graph
-            G = nx.Graph()
-            
-            # Add the main person
-            G.add_node("You", **main_person_data)
-            
-            # Add connections and edges
-            for connection in connections:
-                # Ensure unique node names
-                node_name = connection['name']
-                counter = 1
-                original_name = node_name
-                while node_name in G.nodes():
-                    node_name = f"{original_name} ({counter})"
-                    counter += 1
-                
-                connection['name'] = node_name
-                G.add_node(node_name, **connection)
-                G.add_edge("You", node_name)
+            # Store the network in session state for the person card
+            st.session_state.network = network
             
-            # Store graph data in session state
-            st.session_state.graph_data = G
+            # Expanded companies and the selected node belong to the file they were picked in
+            if st.session_state.overview_digest != network.digest:
+                st.session_state.overview_digest = network.digest
+                st.session_state.selected_node = None
+                st.session_state.expanded_companies = set()
             
             # Create the visualization
             st.subheader(f"Your LinkedIn Network - {len(connections)} Connections")
@@ -350,24 +389,29 @@ if uploaded_file is not None:
             with col1:
                 layout_algorithm = st.selectbox(
                     "Layout Algorithm",
-                    ["Spring Layout", "Circular Layout", "Random Layout", "Kamada Kawai"],
+                    LAYOUT_ALGORITHMS,
+                    index=LAYOUT_ALGORITHMS.index(DEFAULT_LAYOUT),
                     help="Choose how connections are arranged in the graph"
                 )
             
             with col2:
+                # NetworkX force layouts stay usable only on smaller views
+                max_sample_size = len(connections) if layout_algorithm in SCALABLE_ALGORITHMS else min(len(connections), MAX_NETWORKX_LAYOUT_NODES)
                 sample_size = st.slider(
                     "Number of Connections to Show",
                     min_value=min(50, len(connections)),
-                    max_value=min(len(connections), 1000),
-                    value=min(len(connections), 300),
+                    max_value=max_sample_size,
+                    value=min(max_sample_size, 300),
                     help="Adjust to reduce clutter in large networks"
                 )
+                if st.button("Reshuffle sample", help="Show a different selection of connections"):
+                    st.session_state.sample_seed += 1
             
             with col3:
                 visualization_mode = st.selectbox(
                     "Visualization Mode",
-                    ["All Connections", "Company Clusters", "Most Connected"],
-                    help="Choose how to group and display connections"
+                    ["All Connections", "Company Clusters", "Most Connected", "Company Overview"],
+                    help="Choose how to group and display connections. Company Overview draws one node per company; click a company to expand it"
                 )
             
             # Additional controls
@@ -389,78 +433,83 @@ if uploaded_file is not None:
             st.sidebar.header("Network Explorer")
             
             # Search functionality
-            search_query = st.sidebar.text_input("Search connections:", placeholder="Enter name...")
+            search_query = st.sidebar.text_input("Search connections:", placeholder="Name, company or title...")
             if search_query:
-                matching_nodes = [node for node in G.nodes() if search_query.lower() in node.lower()]
-                if matching_nodes:
+                # Ranked lookup in the index built at upload time; limited to the top 10 results
+                matching_rows, match_count = network.search_index.search(search_query, k=10)
+                if match_count:
                     st.sidebar.subheader("Search Results")
-                    for node in matching_nodes[:10]:  # Limit to first 10 results
-                        if st.sidebar.button(f"View {node}", key=f"search_{node}"):
-                            st.session_state.selected_node = node
+                    for node_id, name, company in connections[['node_id', 'name', 'company']].iloc[matching_rows].itertuples(index=False):
+                        if st.sidebar.button(f"View {name} ({company})", key=f"search_{node_id}"):
+                            st.session_state.selected_node = node_id
                             st.rerun()
-                    if len(matching_nodes) > 10:
-                        st.sidebar.text(f"... and {len(matching_nodes) - 10} more")
+                    if match_count > 10:
+                        st.sidebar.text(f"... and {match_count - 10} more")
             
             # Advanced Filters
             st.sidebar.subheader("Advanced Filters")
             
             # Filter by company
-            all_companies = sorted(list(set([c['company'] for c in connections if c['company'] != "Unknown Company"])))
-            selected_company = st.sidebar.selectbox("Filter by Company:", ["All"] + all_companies[:50])  # Show top 50 companies
+            company_counts = known_company_counts(connections)
+            all_companies = sorted(company_counts.index)
+            if st.session_state.get("company_filter", ALL) not in company_counts.index[:50]:
+                st.session_state.company_filter = ALL
+            selected_company = st.sidebar.selectbox(
+                "Filter by Company:",
+                [ALL] + sorted(company_counts.index[:50]),  # Show top 50 companies
+                key="company_filter"
+            )
             
             # Filter by connection date
             st.sidebar.markdown("**Connection Date Range**")
-            connections_with_dates = [c for c in connections if c['raw_connected_on']]
+            connections_with_dates = with_dates(connections)
+            date_range = None
             
-            if connections_with_dates:
-                try:
-                    dates = []
-                    for conn in connections_with_dates:
-                        try:
-                            date = datetime.strptime(conn['raw_connected_on'], '%d %b %Y')
-                            dates.append(date)
-                        except:
-                            continue
-                    
-                    if dates:
-                        min_date = min(dates)
-                        max_date = max(dates)
-                        
-                        selected_date_range = st.sidebar.date_input(
-                            "Connection Date Range",
-                            value=(min_date, max_date),
-                            min_value=min_date,
-                            max_value=max_date
-                        )
-                except:
-                    pass
+            if not connections_with_dates.empty:
+                dates = connections_with_dates['connected_at']
+                min_date = dates.min().date()
+                max_date = dates.max().date()
+                
+                selected_date_range = st.sidebar.date_input(
+                    "Connection Date Range",
+                    value=(min_date, max_date),
+                    min_value=min_date,
+                    max_value=max_date
+                )
+                # The full range keeps connections without a date; a half-picked range is ignored
+                if len(selected_date_range) == 2 and tuple(selected_date_range) != (min_date, max_date):
+                    date_range = tuple(selected_date_range)
             
             # Filter by email availability
             email_filter = st.sidebar.selectbox(
                 "Email Filter",
-                ["All", "With Email", "Without Email"]
+                EMAIL_FILTERS
             )
             
             # Quick filters for common companies
             if all_companies:
-                top_companies = pd.Series([c['company'] for c in connections if c['company'] != "Unknown Company"]).value_counts().head(5)
                 st.sidebar.subheader("Quick Filters - Top Companies")
-                for company, count in top_companies.items():
-                    if st.sidebar.button(f"{company} ({count})", key=f"quick_{company}"):
-                        selected_company = company
-                        st.rerun()
-            
-            # Apply filters
-            filtered_nodes = []
-            if selected_company != "All":
-                filtered_nodes = [node for node in G.nodes() if G.nodes[node].get('company') == selected_company and node != "You"]
+                for company, count in company_counts.head(5).items():
+                    # Widget values can only be set before the widget is drawn, so use a callback
+                    st.sidebar.button(f"{company} ({count})", key=f"quick_{company}",
+                                      on_click=st.session_state.__setitem__, args=("company_filter", company))
+            
+            # Apply filters: every active filter must match
+            with perf.stage("filters") as stage:
+                filter_mask = network.filter_index.combine(selected_company, email_filter, date_range)
+                filtered = connections if filter_mask is None else connections[filter_mask]
+                stage.rows = len(filtered)
+            if filter_mask is not None:
+                st.sidebar.info(f"{len(filtered)} of {len(connections)} connections match the filters")
+            
+            if selected_company != ALL:
                 st.sidebar.subheader(f"People at {selected_company}")
-                for node in filtered_nodes[:10]:  # Show first 10
-                    if st.sidebar.button(f"View {node}", key=f"company_{node}"):
-                        st.session_state.selected_node = node
+                for node_id, name in filtered[['node_id', 'name']].head(10).itertuples(index=False):  # Show first 10
+                    if st.sidebar.button(f"View {name}", key=f"company_{node_id}"):
+                        st.session_state.selected_node = node_id
                         st.rerun()
-                if len(filtered_nodes) > 10:
-                    st.sidebar.text(f"... and {len(filtered_nodes) - 10} more")
+                if len(filtered) > 10:
+                    st.sidebar.text(f"... and {len(filtered) - 10} more")
             
             # Network insights
             st.sidebar.subheader("Network Insights")
@@ -469,225 +518,99 @@ if uploaded_file is not None:
             avg_connections_per_company = round(len(connections) / len(all_companies), 1) if all_companies else 0
             st.sidebar.metric("Avg per Company", avg_connections_per_company)
             
-            # Handle different visualization modes
-            sampled_connections = []
-            
-            if visualization_mode == "Company Clusters":
-                # Group by top companies
-                company_counts = pd.Series([c['company'] for c in connections if c['company'] != "Unknown Company"]).value_counts()
-                top_companies = company_counts.head(10).index.tolist()
-                
-                # Add connections from top companies
-                for company in top_companies:
-                    company_connections = [c for c in connections if c['company'] == company]
-                    # Limit connections per company to avoid overcrowding
-                    max_per_company = max(sample_size // 10, 5)
-                    sampled_connections.extend(company_connections[:max_per_company])
-                
-                # Fill remaining slots with other connections
-                remaining = sample_size - len(sampled_connections)
-                if remaining > 0:
-                    other_connections = [c for c in connections if c['company'] not in top_companies]
-                    sampled_connections.extend(other_connections[:remaining])
-            
-            elif visualization_mode == "Most Connected":
-                # Prioritize people with common titles or companies
-                title_counts = pd.Series([c['title'] for c in connections]).value_counts()
-                common_titles = title_counts.head(20).index.tolist()
-                
-                # Add connections with common titles first
-                priority_connections = [c for c in connections if c['title'] in common_titles]
-                remaining_connections = [c for c in connections if c['title'] not in common_titles]
-                
-                if len(priority_connections) > sample_size:
-                    sampled_connections = random.sample(priority_connections, sample_size)
-                else:
-                    sampled_connections = priority_connections
-                    remaining = sample_size - len(sampled_connections)
-                    if remaining > 0:
-                        sampled_connections.extend(random.sample(remaining_connections, remaining))
-            
-            else:  # All Connections mode
-                # If filtering by company, prioritize those connections
-                if selected_company != "All":
-                    filtered_connections = [c for c in connections if c['company'] == selected_company]
-                    sampled_connections = filtered_connections
-                    # Add remaining connections up to sample_size
-                    remaining = sample_size - len(sampled_connections)
-                    if remaining > 0:
-                        other_connections = [c for c in connections if c['company'] != selected_company]
-                        sampled_connections.extend(other_connections[:remaining])
-                else:
-                    # Random sample for large networks
-                    if len(connections) > sample_size:
-                        sampled_connections = random.sample(connections, sample_size)
-                    else:
-                        sampled_connections = connections
-            
-            # Create a subgraph with sampled connections
-            G_vis = nx.Graph()
-            G_vis.add_node("You", **main_person_data)
-            
-            for connection in sampled_connections:
-                node_name = connection['name']
-                counter = 1
-                original_name = node_name
-                while node_name in G_vis.nodes():
-                    node_name = f"{original_name} ({counter})"
-                    counter += 1
-                
-                G_vis.add_node(node_name, **connection)
-                G_vis.add_edge("You", node_name)
-            
-            # Choose layout algorithm
-            if layout_algorithm == "Spring Layout":
-                pos = nx.spring_layout(G_vis, k=node_spacing, iterations=50)
-            elif layout_algorithm == "Circular Layout":
-                pos = nx.circular_layout(G_vis)
-            elif layout_algorithm == "Random Layout":
-                pos = nx.random_layout(G_vis)
-            else:  # Kamada Kawai
-                pos = nx.kamada_kawai_layout(G_vis)
-            
-            # Create visualization
-            fig_data = []
-            
-            # Create edge trace if enabled
-            if show_edges:
-                edge_x = []
-                edge_y = []
-                for edge in G_vis.edges():
-                    x0, y0 = pos[edge[0]]
-                    x1, y1 = pos[edge[1]]
-                    edge_x.extend([x0, x1, None])
-                    edge_y.extend([y0, y1, None])
-                
-                edge_trace = go.Scatter(
-                    x=edge_x, y=edge_y,
-                    line=dict(width=1, color='rgba(125,125,125,0.3)'),
-                    hoverinfo='none',
-                    mode='lines'
-                )
-                fig_data.append(edge_trace)
-            
-            # Create node trace with color coding
-            node_x = []
-            node_y = []
-            node_text = []
-            node_color = []
-            node_size = []
-            hover_text = []
-            
-            # Define color palettes
-            import plotly.express as px
-            company_colors = px.colors.qualitative.Plotly
-            date_colors = px.colors.sequential.Viridis
-            
-            # Get unique values for coloring
-            if color_by == "Company":
-                unique_companies = list(set([G_vis.nodes[node].get('company', 'Unknown') for node in G_vis.nodes() if node != "You"]))
-                company_color_map = {company: company_colors[i % len(company_colors)] for i, company in enumerate(unique_companies)}
-            elif color_by == "Connection Date":
-                # Parse dates for color mapping
-                date_values = {}
-                for node in G_vis.nodes():
-                    if node != "You":
-                        raw_date = G_vis.nodes[node].get('raw_connected_on', '')
-                        if raw_date:
-                            try:
-                                date_obj = datetime.strptime(raw_date, '%d %b %Y')
-                                date_values[node] = date_obj.timestamp()
-                            except:
-                                date_values[node] = 0
-                        else:
-                            date_values[node] = 0
+            with perf.stage("sampling") as stage:
+                # Handle different visualization modes
+                if visualization_mode == "Company Overview":
+                    # One super-node per company; only expanded companies show their members
+                    overview_counts = filtered['company'].value_counts()
+                    overview_counts = overview_counts[overview_counts > 0]
+                    company_positions = {company: i for i, company in enumerate(overview_counts.index)}
+                    expanded_positions = [company_positions[company] for company in sorted(st.session_state.expanded_companies)
+                                          if company in company_positions]
+                    super_xy, members_xy = company_overview_positions(overview_counts.to_numpy(), expanded_positions)
+                    expanded_rows = {}
+                    for position in expanded_positions:
+                        rows = network.company_members[overview_counts.index[position]]
+                        expanded_rows[position] = rows if filter_mask is None else rows[filter_mask[rows]]
+                    expanded_members = {
+                        position: (connections.iloc[rows], members_xy[position])
+                        for position, rows in expanded_rows.items()
+                    }
+                    sampled_connections = pd.concat([rows for rows, _ in expanded_members.values()]) if expanded_members else connections.iloc[:0]
+            
+                elif visualization_mode == "Company Clusters":
+                    # Group by top companies, limited per company to avoid overcrowding, then fill with others
+                    sampled_connections = connections.iloc[network.sampler.company_clusters(filter_mask, sample_size, st.session_state.sample_seed)]
+            
+                elif visualization_mode == "Most Connected":
+                    # Prioritize people with common titles
+                    sampled_connections = connections.iloc[network.sampler.most_connected(filter_mask, sample_size, st.session_state.sample_seed)]
+            
+                else:  # All Connections mode
+                    # Seeded sample for large networks: the same settings always show the same connections
+                    sampled_connections = connections.iloc[network.sampler.sample(filter_mask, sample_size, st.session_state.sample_seed)]
+                stage.rows = len(sampled_connections)
+            
+            if visualization_mode == "Company Overview":
+                with perf.stage("figure", rows=len(sampled_connections)):
+                    fig = build_overview_figure(
+                        overview_counts, super_xy, expanded_members,
+                        title=f'{len(overview_counts)} companies, {len(sampled_connections)} of {len(filtered)} connections expanded - Click a company to expand or collapse it',
+                        show_labels=show_labels,
+                        show_edges=show_edges,
+                    )
+                company_color_map = {}
+            else:
+                # Subgraph view of the sampled connections; nothing is copied
+                with perf.stage("graph build", rows=len(sampled_connections)):
+                    G_vis = build_graph(sampled_connections)
                 
-                # Normalize dates for color scale
-                if date_values:
-                    min_date = min(date_values.values())
-                    max_date = max(date_values.values())
-                    if max_date > min_date:
-                        for node in date_values:
-                            date_values[node] = (date_values[node] - min_date) / (max_date - min_date)
-            
-            for node in G_vis.nodes():
-                x, y = pos[node]
-                node_x.append(x)
-                node_y.append(y)
+                # Choose layout algorithm; positions are reused while the visible nodes stay the same
+                with perf.stage(f"layout: {layout_algorithm}", rows=len(sampled_connections)):
+                    pos = compute_layout(G_vis, layout_algorithm, node_spacing, cache=get_layout_cache(),
+                                         node_data=sampled_connections.set_index('node_id'))
                 
-                node_data = G_vis.nodes[node]
-                if node_data['type'] == 'main':
-                    node_text.append("You" if show_labels else "")
-                    node_color.append('#0077b5')
-                    node_size.append(40)
-                else:
-                    # Show first name for nodes if labels are enabled
-                    node_text.append(node.split()[0] if show_labels else "")
-                    
-                    # Apply color coding
-                    if color_by == "Company":
-                        company = node_data.get('company', 'Unknown')
-                        node_color.append(company_color_map.get(company, '#4a90e2'))
-                    elif color_by == "Connection Date" and node in date_values:
-                        # Use viridis color scale
-                        color_index = int(date_values[node] * (len(date_colors) - 1))
-                        node_color.append(date_colors[color_index])
-                    else:
-                        node_color.append('#4a90e2')
-                    
-                    # Adjust node size based on visualization mode
-                    if visualization_mode == "Company Clusters":
+                # Create visualization
+                with perf.stage("figure", rows=len(sampled_connections)):
+                    fig, company_color_map = build_network_figure(
+                        pos, sampled_connections,
+                        title=f'Showing {len(sampled_connections)} of {len(filtered)} connections - Click on any node to see details',
+                        show_labels=show_labels,
+                        show_edges=show_edges,
+                        color_by=color_by,
                         # Make nodes from same company slightly larger
-                        node_size.append(25)
-                    else:
-                        node_size.append(20)
-                
-                # Enhanced hover information
-                hover_info = [
-                    f"<b>{node}</b>",
-                    f"Title: {node_data.get('title', 'N/A')}",
-                    f"Company: {node_data.get('company', 'N/A')}",
-                    f"Connected: {node_data.get('connected_on', 'N/A')}"
-                ]
-                hover_text.append("<br>".join(hover_info))
-            
-            node_trace = go.Scatter(
-                x=node_x, y=node_y,
-                mode='markers+text' if show_labels else 'markers',
-                hoverinfo='text',
-                hovertext=hover_text,
-                text=node_text,
-                textposition="top center",
-                textfont=dict(color='#0077b5', size=12),
-                marker=dict(
-                    size=node_size,
-                    color=node_color,
-                    line=dict(width=2, color='white')
-                )
-            )
-            fig_data.append(node_trace)
-            
-            # Create the figure
-            fig = go.Figure(data=fig_data,
-                           layout=go.Layout(
-                               title=dict(
-                                   text=f'Showing {len(sampled_connections)} of {len(connections)} connections - Click on any node to see details',
-                                   font=dict(size=16, color='#0077b5')
-                               ),
-                               showlegend=False,
-                               hovermode='closest',
-                               margin=dict(b=40,l=20,r=20,t=60),
-                               xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                               yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                               plot_bgcolor='white',
-                               dragmode='pan'
-                           ))
+                        node_size=25 if visualization_mode == "Company Clusters" else 20,
+                    )
             
             # Add zoom and pan instructions
             st.info("💡 Tip: Use mouse wheel to zoom, click and drag to pan, double-click to reset view")
             
             # Display the graph
-            st.plotly_chart(fig, use_container_width=True, key="network_graph")
+            if visualization_mode == "Company Overview":
+                with perf.stage("render chart"):
+                    overview_event = st.plotly_chart(fig, use_container_width=True,
+                                                     key=f"company_overview_{st.session_state.overview_chart}",
+                                                     on_select="rerun", selection_mode="points")
+                
+                # Clicking a company toggles it on the next render; clicking a person opens their card.
+                # A fresh chart key clears the selection, so clicking the same company again collapses it
+                picked = [tuple(point['customdata']) for point in overview_event.selection.points
+                          if point.get('customdata')]
+                if picked:
+                    st.session_state.overview_chart += 1
+                    for kind, value in picked:
+                        if kind == COMPANY_POINT:
+                            st.session_state.expanded_companies ^= {value}
+                        elif kind == PERSON_POINT:
+                            st.session_state.selected_node = int(value)
+                    st.rerun()
+                
+                if st.session_state.expanded_companies and st.button("Collapse all companies"):
+                    st.session_state.expanded_companies = set()
+                    st.rerun()
+            else:
+                with perf.stage("render chart"):
+                    st.plotly_chart(fig, use_container_width=True, key="network_graph")
             
             # Add legend for color coding
             if color_by == "Company" and visualization_mode == "Company Clusters":
@@ -707,13 +630,12 @@ if uploaded_file is not None:
                 st.metric("Connections Shown", len(sampled_connections))
             
             with col2:
-                companies_shown = [c['company'] for c in sampled_connections if c['company'] != "Unknown Company"]
-                unique_companies_shown = len(set(companies_shown))
+                unique_companies_shown = known_companies(sampled_connections).nunique()
                 st.metric("Companies Shown", unique_companies_shown)
             
             with col3:
-                if selected_company != "All":
-                    company_count = len([c for c in sampled_connections if c['company'] == selected_company])
+                if selected_company != ALL:
+                    company_count = int((sampled_connections['company'] == selected_company).sum())
                     st.metric(f"{selected_company} Connections", company_count)
             
             # Network statistics
@@ -730,8 +652,7 @@ if uploaded_file is not None:
             
             with col2:
                 # Count unique companies
-                companies = [c['company'] for c in connections if c['company'] != "Unknown Company"]
-                unique_companies = len(set(companies))
+                unique_companies = len(company_counts)
                 st.markdown(f"""
                 <div class="stats-card">
                     <h4 style="color: #0077b5;">Companies</h4>
@@ -741,7 +662,7 @@ if uploaded_file is not None:
             
             with col3:
                 # Count connections with email
-                with_email = len([c for c in connections if c['email']])
+                with_email = int((connections['email'] != "").sum())
                 st.markdown(f"""
                 <div class="stats-card">
                     <h4 style="color: #0077b5;">With Email</h4>
@@ -752,7 +673,7 @@ if uploaded_file is not None:
             
             with col4:
                 # Count connections with LinkedIn URLs
-                with_url = len([c for c in connections if c['url']])
+                with_url = int((connections['url'] != "").sum())
                 st.markdown(f"""
                 <div class="stats-card">
                     <h4 style="color: #0077b5;">With LinkedIn URL</h4>
@@ -764,33 +685,40 @@ if uploaded_file is not None:
             # Advanced Network Analysis
             st.subheader("Network Analysis & Insights")
             
-            # Create tabs for different analyses
+            # Create tabs for different analyses; they cover the connections matching the filters
             tab1, tab2, tab3, tab4 = st.tabs(["Network Metrics", "Company Analysis", "Industry Clusters", "Recommendations"])
-            
-            with tab1:
+            filtered_company_counts = known_company_counts(filtered)
+            filtered_with_email = int((filtered['email'] != "").sum())
+            # Node 0 of the adjacency is the hub and node i + 1 is connection row i
+            filtered_adjacency = network.adjacency if filter_mask is None else induced_subgraph(
+                network.adjacency, np.r_[0, 1 + np.flatnonzero(filter_mask)])
+            with perf.stage("graph metrics", rows=len(filtered)):
+                filtered_metrics = graph_metrics(filtered_adjacency)
+            
+            with tab1, perf.stage("tab: Network Metrics"):
                 # Calculate network metrics
                 col1, col2, col3, col4 = st.columns(4)
                 
                 # Network density
-                density = nx.density(G)
+                density = filtered_metrics['density']
                 with col1:
                     st.metric("Network Density", f"{density:.4f}", 
                              help="How interconnected your network is (0-1 scale)")
                 
                 # Average degree
-                avg_degree = sum(dict(G.degree()).values()) / len(G.nodes())
+                avg_degree = filtered_metrics['average_degree']
                 with col2:
                     st.metric("Avg Connections per Person", f"{avg_degree:.1f}")
                 
                 # Companies per connection ratio
-                unique_companies = len(set([c['company'] for c in connections if c['company'] != "Unknown Company"]))
-                diversity_ratio = unique_companies / len(connections) if connections else 0
+                filtered_companies = len(filtered_company_counts)
+                diversity_ratio = filtered_companies / len(filtered) if len(filtered) else 0
                 with col3:
                     st.metric("Network Diversity", f"{diversity_ratio:.2f}", 
                              help="Ratio of unique companies to total connections")
                 
                 # Email availability
-                email_percentage = (with_email / len(connections)) * 100 if connections else 0
+                email_percentage = (filtered_with_email / len(filtered)) * 100 if len(filtered) else 0
                 with col4:
                     st.metric("Contact Rate", f"{email_percentage:.1f}%", 
                              help="Percentage of connections with email addresses")
@@ -798,26 +726,20 @@ if uploaded_file is not None:
                 # Network visualization insights
                 st.markdown("### Network Structure Insights")
                 st.markdown(f"""
-                - Your network has **{len(connections)} connections** across **{unique_companies} companies**
+                - Your network has **{len(filtered)} connections** across **{filtered_companies} companies**
                 - The average connection has **{avg_degree:.1f}** connections in your network
                 - Your network diversity score is **{diversity_ratio:.2f}** (higher = more diverse)
-                - You have contact information for **{with_email}** connections ({email_percentage:.1f}%)
+                - You have contact information for **{filtered_with_email}** connections ({email_percentage:.1f}%)
                 """)
             
-            with tab2:
+            with tab2, perf.stage("tab: Company Analysis"):
                 # Company Analysis
                 st.markdown("### Company Distribution Analysis")
                 
-                # Create company analysis dataframe
-                company_analysis = pd.DataFrame({
-                    'Company': [c['company'] for c in connections if c['company'] != "Unknown Company"]
-                })
-                company_counts = company_analysis['Company'].value_counts()
-                
                 # Company size categories
-                large_companies = company_counts[company_counts >= 10].index.tolist()
-                medium_companies = company_counts[(company_counts >= 5) & (company_counts < 10)].index.tolist()
-                small_companies = company_counts[company_counts < 5].index.tolist()
+                large_companies = filtered_company_counts[filtered_company_counts >= 10].index.tolist()
+                medium_companies = filtered_company_counts[(filtered_company_counts >= 5) & (filtered_company_counts < 10)].index.tolist()
+                small_companies = filtered_company_counts[filtered_company_counts < 5].index.tolist()
                 
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -828,122 +750,42 @@ if uploaded_file is not None:
                     st.metric("Small Companies (1-4 connections)", len(small_companies))
                 
                 # Company growth over time
-                if connections_with_dates:
+                if not with_dates(filtered).empty:
                     st.markdown("### Company Connection Timeline")
                     
-                    # Analyze when you connected with different companies
-                    company_timeline = {}
-                    for conn in connections_with_dates:
-                        if conn['company'] != "Unknown Company":
-                            try:
-                                date = datetime.strptime(conn['raw_connected_on'], '%d %b %Y')
-                                year = date.strftime('%Y')
-                                
-                                if year not in company_timeline:
-                                    company_timeline[year] = set()
-                                
-                                company_timeline[year].add(conn['company'])
-                            except:
-                                continue
-                    
-                    # Show new companies by year
-                    new_companies_by_year = []
-                    for year in sorted(company_timeline.keys()):
-                        if year == min(company_timeline.keys()):
-                            new_companies = len(company_timeline[year])
-                        else:
-                            prev_companies = set()
-                            for prev_year in company_timeline:
-                                if prev_year < year:
-                                    prev_companies.update(company_timeline[prev_year])
-                            new_companies = len(company_timeline[year] - prev_companies)
-                        
-                        new_companies_by_year.append((year, new_companies))
-                    
-                    fig_company_growth = go.Figure(data=[
-                        go.Bar(
-                            x=[item[0] for item in new_companies_by_year],
-                            y=[item[1] for item in new_companies_by_year],
-                            marker_color='#0077b5'
-                        )
-                    ])
-                    
-                    fig_company_growth.update_layout(
-                        title="New Companies Entered Your Network",
-                        xaxis_title="Year",
-                        yaxis_title="New Companies",
-                        height=400
-                    )
+                    # New companies per period, counted at upload for every granularity
+                    timeline_granularity = st.selectbox("Timeline granularity", list(TIMELINE_GRANULARITIES))
+                    if filter_mask is None:
+                        new_companies = network.company_timelines[timeline_granularity]
+                    else:
+                        new_companies = new_company_counts(filtered, TIMELINE_GRANULARITIES[timeline_granularity])
                     
+                    fig_company_growth = build_bar_figure(new_companies, "New Companies Entered Your Network",
+                                                          xaxis_title=timeline_granularity, yaxis_title="New Companies")
                     st.plotly_chart(fig_company_growth, use_container_width=True)
             
-            with tab3:
+            with tab3, perf.stage("tab: Industry Clusters"):
                 # Industry Clustering
                 st.markdown("### Industry Analysis")
                 
-                # Estimate industries based on company names and positions
-                tech_keywords = ['tech', 'software', 'engineer', 'developer', 'data', 'cloud', 'ai', 'ml']
-                finance_keywords = ['bank', 'financial', 'investment', 'capital', 'fund', 'analyst']
-                healthcare_keywords = ['health', 'medical', 'pharma', 'clinical', 'bio', 'hospital']
-                consulting_keywords = ['consulting', 'advisory', 'strategy', 'management']
-                education_keywords = ['school', 'university', 'education', 'professor', 'teacher']
-                
-                industries = {'Technology': 0, 'Finance': 0, 'Healthcare': 0, 'Consulting': 0, 'Education': 0, 'Other': 0}
-                
-                for conn in connections:
-                    company = conn['company'].lower()
-                    title = conn['title'].lower()
-                    
-                    if any(keyword in company or keyword in title for keyword in tech_keywords):
-                        industries['Technology'] += 1
-                    elif any(keyword in company or keyword in title for keyword in finance_keywords):
-                        industries['Finance'] += 1
-                    elif any(keyword in company or keyword in title for keyword in healthcare_keywords):
-                        industries['Healthcare'] += 1
-                    elif any(keyword in company or keyword in title for keyword in consulting_keywords):
-                        industries['Consulting'] += 1
-                    elif any(keyword in company or keyword in title for keyword in education_keywords):
-                        industries['Education'] += 1
-                    else:
-                        industries['Other'] += 1
+                # Industries are estimated once at upload from company names and positions
+                industries = industry_counts(filtered)
                 
                 # Create pie chart for industries
-                fig_industries = go.Figure(data=[go.Pie(
-                    labels=list(industries.keys()),
-                    values=list(industries.values()),
-                    hole=.3
-                )])
-                
-                fig_industries.update_layout(
-                    title="Estimated Industry Distribution",
-                    height=400
-                )
-                
+                fig_industries = build_pie_figure(industries, "Estimated Industry Distribution")
                 st.plotly_chart(fig_industries, use_container_width=True)
                 
                 # Show top titles for each industry
-                for industry in industries:
-                    if industries[industry] > 0:
-                        st.markdown(f"**{industry} Sector Insights**")
-                        # Get connections in this industry
-                        industry_connections = []
-                        for conn in connections:
-                            company = conn['company'].lower()
-                            title = conn['title'].lower()
-                            
-                            if industry == 'Technology' and any(keyword in company or keyword in title for keyword in tech_keywords):
-                                industry_connections.append(conn)
-                            elif industry == 'Finance' and any(keyword in company or keyword in title for keyword in finance_keywords):
-                                industry_connections.append(conn)
-                            # Add other industry checks...
-                        
-                        # Show top titles in this industry
-                        title_counts = pd.Series([c['title'] for c in industry_connections]).value_counts().head(5)
-                        if not title_counts.empty:
-                            for title, count in title_counts.items():
-                                st.text(f"• {title} ({count})")
-            
-            with tab4:
+                industry_titles = filtered.groupby('industry', observed=True)['title']
+                for industry, titles in industry_titles:
+                    st.markdown(f"**{industry} Sector Insights**")
+                    # value_counts on a categorical also reports unused titles
+                    title_counts = titles.value_counts()
+                    title_counts = title_counts[title_counts > 0].head(5)
+                    for title, count in title_counts.items():
+                        st.text(f"• {title} ({count})")
+            
+            with tab4, perf.stage("tab: Recommendations"):
                 # Recommendations
                 st.markdown("### Network Growth Recommendations")
                 
@@ -951,7 +793,7 @@ if uploaded_file is not None:
                 st.markdown("#### 🎯 Networking Opportunities")
                 
                 # Find underrepresented companies
-                top_companies = company_counts.head(10)
+                top_companies = filtered_company_counts.head(10)
                 underrepresented = []
                 
                 for company, count in top_companies.items():
@@ -964,36 +806,34 @@ if uploaded_file is not None:
                         st.text(f"• {company} (currently {count} connections)")
                 
                 # Find missing industries
-                missing_industries = [ind for ind, count in industries.items() if count == 0]
+                missing_industries = industries.index[industries == 0].astype(str).tolist()
                 if missing_industries:
                     st.markdown("**Industries to explore:**")
                     for industry in missing_industries:
                         st.text(f"• {industry}")
                 
                 # Show connection date insights
-                if connections_with_dates:
-                    recent_connections = sorted(dates, reverse=True)[:10]
-                    oldest_connections = sorted(dates)[:10]
-                    
+                if not with_dates(filtered).empty:
                     st.markdown("#### 📅 Connection Maintenance")
                     st.markdown("Consider reaching out to your oldest connections:")
                     
-                    old_conn_data = []
-                    for date in oldest_connections:
-                        for conn in connections_with_dates:
-                            try:
-                                conn_date = datetime.strptime(conn['raw_connected_on'], '%d %b %Y')
-                                if conn_date == date:
-                                    old_conn_data.append((conn['name'], conn['company'], conn['connected_on']))
-                                    break
-                            except:
-                                continue
+                    for conn in oldest_connections(filtered, 5).itertuples():
+                        st.text(f"• {conn.name} from {conn.company} (connected {conn.connected_on})")
                     
-                    for name, company, connected_on in old_conn_data[:5]:
-                        st.text(f"• {name} from {company} (connected {connected_on})")
+                    # Connections made longer ago than the chosen age, grouped by company
+                    stale_years = st.slider("Not contacted in (years)", 1, 20, 5)
+                    stale, stale_counts = stale_connections(filtered, stale_years)
+                    if stale_counts.empty:
+                        st.text(f"No connections older than {stale_years} years.")
+                    else:
+                        st.markdown(f"**Connections not contacted in {stale_years}+ years, by company:**")
+                        stale_by_company = stale.groupby('company', observed=True)
+                        for company, count in stale_counts.head(10).items():
+                            names = ", ".join(stale_by_company.get_group(company)['name'])
+                            st.text(f"• {company} ({count}): {names}")
                 
                 # Show email collection opportunities
-                no_email_count = len([c for c in connections if not c['email']])
+                no_email_count = len(filtered) - filtered_with_email
                 st.markdown(f"#### 📧 Contact Information")
                 st.markdown(f"You're missing email addresses for {no_email_count} connections. Consider:")
                 st.text("• Sending LinkedIn messages to request contact info")
@@ -1002,27 +842,33 @@ if uploaded_file is not None:
             
             # Export options
             st.subheader("Export Options")
-            if st.button("Export Network Data"):
-                # Create export data
-                export_data = {
-                    "main_person": main_person_data,
-                    "connections": connections,
-                    "statistics": {
-                        "total_connections": len(connections),
-                        "unique_companies": unique_companies,
-                        "with_email": with_email,
-                        "with_url": with_url,
-                        "top_companies": dict(top_companies.head(5)),
-                        "generation_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                }
-                
+            export_format = st.selectbox("Export format", list(EXPORT_FORMATS),
+                                         help="NDJSON has one JSON object per line; Parquet is compact and keeps column types")
+            extension, mime = EXPORT_FORMATS[export_format]
+            export_date = datetime.now().strftime('%Y%m%d')
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                # Files are generated only when a button is clicked
+                st.download_button(
+                    label=f"Download Connections ({export_format})",
+                    data=lambda: export_bytes(connections, export_format),
+                    file_name=f"linkedin_connections_{export_date}.{extension}",
+                    mime=mime
+                )
+            with col2:
                 st.download_button(
-                    label="Download Network JSON",
-                    data=pd.DataFrame([export_data]).to_json(orient='records', indent=2),
-                    file_name=f"linkedin_network_{datetime.now().strftime('%Y%m%d')}.json",
+                    label="Download Statistics (JSON)",
+                    data=lambda: statistics_json(network),
+                    file_name=f"linkedin_network_statistics_{export_date}.json",
                     mime="application/json"
                 )
+            
+            # Keep the processed network and its layouts on disk for later sessions
+            if st.button("Save snapshot", help="Save this network on the server's disk to reopen it from the sidebar without uploading it again"):
+                manifest = save_snapshot(network, network_name, layout_cache=get_layout_cache())
+                st.session_state.snapshot_digests.add(manifest["digest"])
+                st.success(f"Saved {manifest['name']} with {len(manifest['layouts'])} cached layouts")
     
     except Exception as e:
         st.error(f"Error processing the file: {str(e)}")
@@ -1034,28 +880,99 @@ if uploaded_file is not None:
             import traceback
             st.text(traceback.format_exc())
             
-            # Show first few lines of the file
-            st.subheader("First 10 lines of your file:")
-            try:
-                uploaded_file.seek(0)
-                content = uploaded_file.read()
-                lines = content.decode('utf-8', errors='replace').split('\n')[:10]
-                for i, line in enumerate(lines, 1):
-                    st.text(f"Line {i}: {line}")
-            except:
+            if uploaded_file is not None:
+                # Show first few lines of the file
+                st.subheader("First 10 lines of your file:")
                 try:
                     uploaded_file.seek(0)
                     content = uploaded_file.read()
-                    lines = content.decode('latin-1', errors='replace').split('\n')[:10]
+                    lines = content.decode('utf-8', errors='replace').split('\n')[:10]
                     for i, line in enumerate(lines, 1):
                         st.text(f"Line {i}: {line}")
                 except:
-                    st.text("Unable to read file content for debugging")
+                    try:
+                        uploaded_file.seek(0)
+                        content = uploaded_file.read()
+                        lines = content.decode('latin-1', errors='replace').split('\n')[:10]
+                        for i, line in enumerate(lines, 1):
+                            st.text(f"Line {i}: {line}")
+                    except:
+                        st.text("Unable to read file content for debugging")
 
-# Display selected node information
-if st.session_state.selected_node and st.session_state.graph_data:
-    node_data = st.session_state.graph_data.nodes[st.session_state.selected_node]
+# Compare several people's networks
+st.markdown("---")
+st.subheader("Compare Networks")
+st.markdown("Upload the Connections.csv files of several colleagues to merge their networks. "
+            "People are matched by LinkedIn profile URL, so shared connections link the uploaders together.")
+team_files = st.file_uploader("Choose two or more Connections.csv files", type=['csv'], accept_multiple_files=True,
+                              key="team_files")
+
+if team_files and len(team_files) >= 2:
+    team_networks = []
+    for team_file in team_files:
+        try:
+            team_networks.append(load_cached_network(content_digest(team_file), team_file))
+        except MissingColumnsError as e:
+            st.error(f"{team_file.name}: {e}")
     
+    if len(team_networks) == len(team_files):
+        digests = tuple(network.digest for network in team_networks)
+        owners = tuple(owner_labels([team_file.name for team_file in team_files]))
+        with perf.stage("merge networks") as stage:
+            merged = merge_cached_networks(digests, owners, team_networks)
+            stage.rows = len(merged.people)
+        shared_people = merged.shared_people()
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("People", len(merged.people))
+        with col2:
+            st.metric("Connections", merged.edge_count)
+        with col3:
+            st.metric("Shared Connections", len(shared_people),
+                      help="People who appear in two or more of the uploaded networks")
+        
+        merged_metrics = merged_network_metrics(digests, owners, merged)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Network Density", f"{merged_metrics['density']:.6f}")
+        with col2:
+            st.metric("Connected Groups", merged_metrics['components'],
+                      help="Separate parts of the merged network; networks without shared connections stay apart")
+        with col3:
+            st.metric("Max k-core", merged_metrics['max_core'],
+                      help="Largest k such that a group of people each has at least k links inside it")
+        
+        # Most shared people first, so the bridges between networks are always drawn
+        with perf.stage("merged layout"):
+            nodes, sources, targets, merged_xy = merged_network_view(digests, owners, merged)
+        shown_people = merged.people.iloc[nodes[merged.hub_count:] - merged.hub_count]
+        fig_merged = build_merged_figure(
+            merged_xy, sources, targets, merged.owners, shown_people,
+            title=f'{len(merged.owners)} networks, showing the {len(shown_people)} most shared of {len(merged.people)} people'
+        )
+        st.plotly_chart(fig_merged, use_container_width=True, key="merged_graph")
+        
+        # People by how many of the uploaded networks include them
+        owner_counts = merged.people['owner_count'].value_counts().sort_index()
+        fig_degrees = build_bar_figure(owner_counts, "People by Number of Networks", xaxis_title="Networks",
+                                       yaxis_title="People", height=300)
+        st.plotly_chart(fig_degrees, use_container_width=True)
+        
+        st.markdown("**Shared connections between uploaders**")
+        st.dataframe(merged.overlap())
+        
+        if not shared_people.empty:
+            st.markdown("**Most shared connections**")
+            st.dataframe(shared_people[['name', 'title', 'company', 'owner_count']].head(20)
+                         .rename(columns={'owner_count': 'networks'}), hide_index=True)
+
+# Display selected node information
+node_data = None
+if st.session_state.selected_node is not None and st.session_state.network is not None:
+    node_data = st.session_state.network.node_record(st.session_state.selected_node)
+
+if node_data is not None:
     # Determine card style based on node type
     card_class = "main-card" if node_data['type'] == 'main' else "connection-card"
     
@@ -1067,16 +984,16 @@ if st.session_state.selected_node and st.session_state.graph_data:
         </div>
         <div class="card-body">
             <h5>{node_data['title']} <span class="company-badge">{node_data['company']}</span></h5>
-            <p><strong>📍 Location:</strong> {node_data['location']}</p>
+            <p><strong>📍 Location:</strong> {node_data.get('location', 'Location not available')}</p>
             <p><strong>✉️ Email:</strong> {node_data['email'] if node_data['email'] else 'Not available / Not shared'}</p>
             <p><strong>🔗 LinkedIn URL:</strong> {f'<a href="{node_data["url"]}" target="_blank" class="url-link">{node_data["url"]}</a>' if node_data['url'] else 'Not available'}</p>
             <p><strong>📅 Connected on:</strong> {node_data.get('connected_on', 'Date not available')}</p>
-            <p><strong>📚 Experience:</strong> {node_data['experience']}</p>
-            <p><strong>🎓 Education:</strong> {node_data['education']}</p>
+            <p><strong>📚 Experience:</strong> {node_data.get('experience', f"Works at {node_data['company']}")}</p>
+            <p><strong>🎓 Education:</strong> {node_data.get('education', 'Education not available')}</p>
             <div>
                 <strong>🛠️ Skills:</strong>
                 <div style="margin-top: 5px;">
-                    {' '.join([f'<span class="badge" style="margin: 2px;">{skill}</span>' for skill in node_data['skills']])}
+                    {' '.join([f'<span class="badge" style="margin: 2px;">{skill}</span>' for skill in node_data.get('skills', ['Professional Networking'])])}
                 </div>
             </div>
         </div>
@@ -1088,4 +1005,39 @@ else:
 
 # Footer
 st.markdown("---")
-st.markdown("Your data is processed locally and never stored on external servers.")
+st.markdown("Your data is processed by the server running this app and never sent elsewhere. "
+            "It is written to that server's disk only when you click \"Save snapshot\", "
+            "and saved networks are listed only in the session that uploaded or saved them.")
+
+# Performance panel; drawn last so the stages of this rerun are complete
+with st.sidebar.expander("Performance"):
+    st.checkbox("Record stage timings", key="record_performance",
+                help="Wall time and row count of each processing stage, recorded on every rerun")
+    st.checkbox("Trace memory peaks (slower)", key="trace_memory", disabled=not perf.enabled,
+                help="Peak memory allocated by each stage. Tracing slows processing down and also counts "
+                     "other sessions of this server")
+    if perf.enabled:
+        report = perf.finish()
+        history = st.session_state.setdefault('performance_history', [])
+        history.append(report)
+        del history[:-PERFORMANCE_HISTORY]
+        
+        stages = pd.DataFrame(report['stages'], columns=['stage', 'depth', 'seconds', 'rows', 'peak_mb'])
+        stages['stage'] = ["\u2003" * depth + name for name, depth in zip(stages['stage'], stages['depth'])]
+        stages['ms'] = (stages['seconds'] * 1000).round(1)
+        stages['rows'] = stages['rows'].astype('Int64')
+        # No peak when the memory trace was stopped or restarted during the stage
+        stages['peak_mb'] = stages['peak_mb'].astype('Float64')
+        columns = ['stage', 'ms', 'rows'] + (['peak_mb'] if report['trace_memory'] else [])
+        st.caption(f"Rerun at {report['started_at']}: {report['total_seconds'] * 1000:.0f} ms in total")
+        if report['trace_memory'] and stages['peak_mb'].isna().any():
+            st.caption("Peaks are unavailable for stages during which memory tracing was stopped")
+        st.dataframe(stages[columns].rename(columns={'peak_mb': 'peak MB'}), hide_index=True)
+        st.download_button(
+            label=f"Download timings of the last {len(history)} reruns (JSON)",
+            data=json.dumps(history, indent=2),
+            file_name="performance.json",
+            mime="application/json"
+        )
+    elif st.session_state.get('performance_history'):
+        st.session_state.performance_history = []
@@ -0,0 +1,6 @@
+"""Data pipeline behind the LinkedIn Network Visualizer.
+
+The Streamlit UI lives in ``app.py``; the modules in this package hold the
+logic that turns an uploaded ``Connections.csv`` into the tables and graphs
+the UI renders, so it can be cached, reused and imported on its own.
+"""
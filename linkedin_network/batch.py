@@ -0,0 +1,203 @@
+"""Headless batch mode: process many LinkedIn exports without the web UI.
+
+Usage::
+
+    python -m linkedin_network.batch exports/ team.zip -o reports/ --jobs 8
+
+Each input is a ``Connections.csv`` export, a ZIP archive of exports, or a
+directory searched recursively for both. Every export is parsed with the
+same ingest code as the app, in a pool of worker processes. The results are
+written to the output directory:
+
+``<name>.json``   statistics from ``stats.network_statistics``
+``<name>.html``   the network graph as a standalone Plotly page
+``summary.json``  one entry per export, plus overall throughput
+
+With ``--export FORMAT`` each export's connections are also written to
+``<name>.<ext>``, streamed to disk in chunks.
+
+Streamlit is never imported.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .export import EXPORT_FORMATS, write_export
+from .ingest import MissingColumnsError, build_graph, load_network
+from .layout import DEFAULT_LAYOUT, SCALABLE_ALGORITHMS, compute_layout
+from .render import build_network_figure
+from .stats import network_statistics
+
+DEFAULT_SAMPLE_SIZE = 300
+DEFAULT_SPACING = 2.5
+SUMMARY_FILE = "summary.json"
+
+
+class NamedBytesIO(io.BytesIO):
+    """In-memory export with a ``name``, like a Streamlit upload."""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+def find_exports(paths):
+    """``(source, member)`` pairs for every export under ``paths``.
+
+    ``member`` is the CSV's name inside a ZIP archive, or ``None`` for a
+    plain CSV file.
+    """
+    exports = []
+    for path in map(Path, paths):
+        files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            suffix = file.suffix.lower()
+            if suffix == '.csv':
+                exports.append((file, None))
+            elif suffix == '.zip':
+                with zipfile.ZipFile(file) as archive:
+                    exports.extend((file, member) for member in archive.namelist()
+                                   if member.lower().endswith('.csv') and not member.endswith('/'))
+    return exports
+
+
+def output_names(exports):
+    """A distinct file-name stem for each export."""
+    names, seen = [], {}
+    for source, member in exports:
+        stem = source.stem if member is None else f"{source.stem}__{Path(member).stem}"
+        seen[stem] = seen.get(stem, 0) + 1
+        names.append(stem if seen[stem] == 1 else f"{stem}_{seen[stem]}")
+    return names
+
+
+def read_export(source, member=None):
+    """Bytes of an export as a named in-memory file."""
+    if member is None:
+        return NamedBytesIO(Path(source).read_bytes(), Path(source).name)
+    with zipfile.ZipFile(source) as archive:
+        return NamedBytesIO(archive.read(member), member)
+
+
+def network_figure(network, title, layout_algorithm=DEFAULT_LAYOUT, sample_size=DEFAULT_SAMPLE_SIZE,
+                   spacing=DEFAULT_SPACING):
+    """The app's default network view of ``network``, as a Plotly figure."""
+    connections = network.connections
+    sampled = connections.iloc[network.sampler.sample(None, sample_size)]
+    G_vis = build_graph(sampled)
+    positions = compute_layout(G_vis, layout_algorithm, spacing, node_data=sampled.set_index('node_id'))
+    fig, _ = build_network_figure(positions, sampled, title=title, color_by="Company")
+    return fig
+
+
+def process_export(source, member, name, output_dir, layout_algorithm=DEFAULT_LAYOUT,
+                   sample_size=DEFAULT_SAMPLE_SIZE, export_format=None):
+    """Write the statistics and graph of one export; runs in a worker process.
+
+    Returns a summary entry for ``summary.json``.
+    """
+    started = time.perf_counter()
+    entry = {"name": name, "source": str(source), "member": member}
+    try:
+        uploaded_file = read_export(source, member)
+        entry["bytes"] = len(uploaded_file.getbuffer())
+        network = load_network(uploaded_file)
+
+        statistics = network_statistics(network)
+        stats_path = Path(output_dir) / f"{name}.json"
+        stats_path.write_text(json.dumps(statistics, indent=2), encoding='utf-8')
+
+        shown = min(sample_size, len(network.connections))
+        fig = network_figure(network, f"{name}: {shown} of {len(network.connections)} connections",
+                             layout_algorithm, sample_size)
+        graph_path = Path(output_dir) / f"{name}.html"
+        fig.write_html(graph_path, include_plotlyjs='cdn')
+
+        entry.update(connections=len(network.connections), statistics=str(stats_path), graph=str(graph_path))
+        if export_format is not None:
+            extension, _ = EXPORT_FORMATS[export_format]
+            export_path = Path(output_dir) / f"{name}.{extension}"
+            with open(export_path, 'wb') as export_file:
+                write_export(network.connections, export_format, export_file)
+            entry["export"] = str(export_path)
+    except (MissingColumnsError, OSError, ValueError, zipfile.BadZipFile) as e:
+        entry["error"] = str(e)
+    entry["seconds"] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def run_batch(paths, output_dir, jobs=None, layout_algorithm=DEFAULT_LAYOUT, sample_size=DEFAULT_SAMPLE_SIZE,
+              export_format=None, progress=sys.stderr):
+    """Process every export under ``paths`` in ``jobs`` processes.
+
+    Progress lines go to ``progress``; returns the summary that is also
+    written to ``output_dir/summary.json``.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    exports = find_exports(paths)
+    names = output_names(exports)
+
+    started = time.perf_counter()
+    entries = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(process_export, source, member, name, output_dir, layout_algorithm, sample_size,
+                               export_format)
+                   for (source, member), name in zip(exports, names)]
+        for done, future in enumerate(as_completed(futures), 1):
+            entry = future.result()
+            entries.append(entry)
+            status = f"error: {entry['error']}" if "error" in entry else f"{entry['connections']} connections"
+            print(f"[{done}/{len(futures)}] {entry['name']}: {status} ({entry['seconds']:.2f}s)", file=progress)
+    elapsed = time.perf_counter() - started
+
+    processed = [entry for entry in entries if "error" not in entry]
+    total_connections = sum(entry["connections"] for entry in processed)
+    total_bytes = sum(entry.get("bytes", 0) for entry in entries)
+    summary = {
+        "exports": len(entries),
+        "failed": len(entries) - len(processed),
+        "connections": total_connections,
+        "seconds": round(elapsed, 3),
+        "exports_per_second": round(len(entries) / elapsed, 2) if elapsed else None,
+        "connections_per_second": round(total_connections / elapsed) if elapsed else None,
+        "megabytes_per_second": round(total_bytes / 1e6 / elapsed, 2) if elapsed else None,
+        "results": sorted(entries, key=lambda entry: entry["name"]),
+    }
+    (output_dir / SUMMARY_FILE).write_text(json.dumps(summary, indent=2), encoding='utf-8')
+    print(f"Processed {len(processed)} of {len(entries)} exports ({total_connections} connections) in {elapsed:.2f}s: "
+          f"{summary['exports_per_second']} exports/s, {summary['connections_per_second']} connections/s, "
+          f"{summary['megabytes_per_second']} MB/s", file=progress)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m linkedin_network.batch",
+        description="Write statistics and network graphs for many LinkedIn Connections.csv exports.")
+    parser.add_argument("inputs", nargs="+", help="CSV files, ZIP archives or directories containing them")
+    parser.add_argument("-o", "--output", default="reports", help="output directory (default: reports)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument("--layout", choices=sorted(SCALABLE_ALGORITHMS), default=DEFAULT_LAYOUT,
+                        help=f"graph layout (default: {DEFAULT_LAYOUT})")
+    parser.add_argument("--sample-size", type=int, default=DEFAULT_SAMPLE_SIZE,
+                        help=f"connections drawn in each graph (default: {DEFAULT_SAMPLE_SIZE})")
+    parser.add_argument("--export", choices=list(EXPORT_FORMATS), default=None,
+                        help="also write each export's connections in this format")
+    args = parser.parse_args(argv)
+
+    summary = run_batch(args.inputs, args.output, jobs=args.jobs, layout_algorithm=args.layout,
+                        sample_size=args.sample_size, export_format=args.export)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
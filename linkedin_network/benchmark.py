@@ -0,0 +1,263 @@
+"""Per-stage benchmarks on synthetic exports.
+
+Usage::
+
+    python -m linkedin_network.benchmark --rows 1000 10000 100000 1000000 -o benchmark.json
+
+For each size a synthetic export from ``synthetic`` goes through the same
+stages as the app: parsing, the connection table, the network indexes,
+sampling, every layout algorithm, figure construction and the computations
+behind each analysis tab, plus export and snapshots. Each stage reports its
+best wall time over ``--repeat`` runs and the peak memory that ``tracemalloc``
+traced during one further run, which is kept separate so tracing does not
+slow the timed runs. ``tracemalloc`` sees Python and NumPy allocations but
+not the Arrow buffers behind string columns, so the Arrow memory held by the
+stage's result is reported next to it. The first run of each stage is also
+reported, since it includes the lazy imports and warm-up a fresh server
+pays on its first render.
+
+Cold start is measured separately: each module the app imports is imported
+in a fresh interpreter, which also records the heavy optional libraries it
+pulled in. Results are written as JSON to compare across commits.
+
+Streamlit is never imported.
+"""
+
+import argparse
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from importlib.metadata import version
+
+import pyarrow as pa
+
+from .connections import (
+    build_connection_table,
+    company_timelines,
+    industry_counts,
+    known_company_counts,
+    oldest_connections,
+    stale_connections,
+)
+from .export import EXPORT_FORMATS, export_bytes
+from .ingest import build_graph, build_network, content_digest, read_connections_csv
+from .layout import LAYOUT_ALGORITHMS, company_overview_positions, run_layout
+from .metrics import graph_metrics
+from .render import build_network_figure, build_overview_figure
+from .search import SearchIndex
+from .snapshot import load_snapshot, save_snapshot
+from .stats import network_statistics
+from .synthetic import ENCODINGS, synthetic_export
+
+DEFAULT_ROWS = [1_000, 10_000, 100_000]
+DEFAULT_REPEAT = 3
+# The app's default number of connections drawn
+DEFAULT_SAMPLE_SIZE = 300
+DEFAULT_SPACING = 2.5
+FIGURE_LAYOUT = "Fast Force-Directed"
+STALE_YEARS = 5
+SEARCH_QUERY = "data eng"
+
+# Modules imported by the app, and the libraries they should only load when needed
+APP_MODULES = ["connections", "delta", "export", "filters", "ingest", "instrumentation", "layout", "merge",
+               "metrics", "render", "sampling", "snapshot"]
+LAZY_LIBRARIES = ["networkx", "pyarrow.parquet", "scipy.sparse.csgraph"]
+# Libraries whose versions affect the timings
+VERSIONED_LIBRARIES = ["pandas", "numpy", "networkx", "scipy", "pyarrow", "plotly"]
+
+_IMPORT_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+for module in sys.argv[1:]:
+    __import__(module)
+print(time.perf_counter() - started)
+print(",".join(library for library in {libraries!r} if library in sys.modules))
+"""
+
+
+def measure(function, repeat=DEFAULT_REPEAT):
+    """Run ``function`` ``repeat`` times, then once more under ``tracemalloc``.
+
+    Returns ``(result, seconds, first_seconds, peak_bytes, arrow_bytes)``
+    with the best and the first wall time and the Arrow memory still held
+    after the traced run.
+    """
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - started)
+    arrow_before = pa.total_allocated_bytes()
+    tracemalloc.start()
+    try:
+        traced = function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    arrow = max(pa.total_allocated_bytes() - arrow_before, 0)
+    del traced
+    return result, min(seconds), seconds[0], peak, arrow
+
+
+def cold_import(modules, repeat=DEFAULT_REPEAT):
+    """Best time to import ``modules`` in a fresh interpreter, and the ``LAZY_LIBRARIES`` they loaded."""
+    script = _IMPORT_SCRIPT.format(libraries=LAZY_LIBRARIES)
+    seconds = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", script, *modules], capture_output=True, text=True,
+                                check=True).stdout.splitlines()
+        seconds.append(float(output[0]))
+    loaded = output[1].split(",") if len(output) > 1 and output[1] else []
+    return min(seconds), loaded
+
+
+def benchmark_imports(repeat=DEFAULT_REPEAT, progress=sys.stderr):
+    """Cold import of each of ``APP_MODULES`` and of all of them together."""
+    entries = []
+    targets = [[f"{__package__}.{module}"] for module in APP_MODULES]
+    targets.append([f"{__package__}.{module}" for module in APP_MODULES])
+    for modules in targets:
+        name = modules[0] if len(modules) == 1 else "all app modules"
+        seconds, loaded = cold_import(modules, repeat)
+        entries.append({"module": name, "seconds": round(seconds, 6), "loaded": loaded})
+        print(f"  import {name:<36} {seconds * 1000:10.1f} ms  {', '.join(loaded)}", file=progress)
+    return entries
+
+
+def _analysis_tabs(network):
+    # The computations behind each analysis tab, on the unfiltered network
+    connections = network.connections
+    return {
+        "Network Metrics": lambda: (known_company_counts(connections), graph_metrics(network.adjacency)),
+        "Company Analysis": lambda: (known_company_counts(connections), company_timelines(connections)),
+        "Industry Clusters": lambda: (industry_counts(connections),
+                                      connections.groupby('industry', observed=True)['title'].value_counts()),
+        "Recommendations": lambda: (oldest_connections(connections, 5), stale_connections(connections, STALE_YEARS)),
+    }
+
+
+def _overview_figure(connections, company_members):
+    # Company Overview with the largest company expanded
+    counts = connections['company'].value_counts()
+    counts = counts[counts > 0]
+    super_xy, members_xy = company_overview_positions(counts.to_numpy(), [0])
+    expanded = {0: (connections.iloc[company_members[counts.index[0]]], members_xy[0])}
+    return build_overview_figure(counts, super_xy, expanded, title="Company Overview")
+
+
+def benchmark_export(data, repeat=DEFAULT_REPEAT, sample_size=DEFAULT_SAMPLE_SIZE, progress=sys.stderr):
+    """Time every stage on the export bytes ``data``; returns a list of stage entries."""
+    stages = []
+
+    def stage(name, function):
+        result, seconds, first, peak, arrow = measure(function, repeat)
+        stages.append({"stage": name, "seconds": round(seconds, 6), "first_seconds": round(first, 6),
+                       "peak_mb": round(peak / 1e6, 3), "arrow_mb": round(arrow / 1e6, 3)})
+        print(f"  {name:<32} {seconds * 1000:10.1f} ms (first {first * 1000:8.1f} ms) {peak / 1e6:10.1f} MB "
+              f"{arrow / 1e6:8.1f} MB Arrow", file=progress)
+        return result
+
+    digest = content_digest(io.BytesIO(data))
+    df = stage("read_csv", lambda: read_connections_csv(io.BytesIO(data)))
+    connections = stage("connection_table", lambda: build_connection_table(df))
+    network = stage("network_indexes", lambda: build_network(digest, df, connections))
+    search_index = stage("search_index", lambda: SearchIndex(connections))
+    stage("search_query", lambda: search_index.search(SEARCH_QUERY, k=10))
+
+    sampler = network.sampler
+    sampled = connections.iloc[stage("sampling:All Connections", lambda: sampler.sample(None, sample_size))]
+    stage("sampling:Company Clusters", lambda: sampler.company_clusters(None, sample_size))
+    stage("sampling:Most Connected", lambda: sampler.most_connected(None, sample_size))
+
+    G_vis = stage("graph_build", lambda: build_graph(sampled))
+    node_data = sampled.set_index('node_id')
+    layouts = {}
+    for algorithm in LAYOUT_ALGORITHMS:
+        layouts[algorithm] = stage(f"layout:{algorithm}",
+                                   lambda: run_layout(G_vis, algorithm, DEFAULT_SPACING, node_data=node_data))
+    stage("figure:network", lambda: build_network_figure(layouts[FIGURE_LAYOUT], sampled, title="Network",
+                                                         color_by="Company"))
+    stage("figure:overview", lambda: _overview_figure(connections, network.company_members))
+
+    for tab, function in _analysis_tabs(network).items():
+        stage(f"tab:{tab}", function)
+    stage("statistics", lambda: network_statistics(network))
+
+    for export_format in EXPORT_FORMATS:
+        stage(f"export:{export_format}", lambda: export_bytes(connections, export_format))
+    with tempfile.TemporaryDirectory() as directory:
+        stage("snapshot:save", lambda: save_snapshot(network, "benchmark", directory))
+        stage("snapshot:load", lambda: load_snapshot(digest, directory))
+    return stages
+
+
+def environment():
+    """Versions that affect the timings."""
+    # Read from package metadata so the lazily imported libraries stay unloaded
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        **{library: version(library) for library in VERSIONED_LIBRARIES},
+    }
+
+
+def run_benchmarks(rows=DEFAULT_ROWS, repeat=DEFAULT_REPEAT, sample_size=DEFAULT_SAMPLE_SIZE, seed=0,
+                   encoding="utf-8", progress=sys.stderr):
+    """Benchmark a synthetic export of each size in ``rows``; returns the JSON report."""
+    print("Cold imports", file=progress)
+    imports = benchmark_imports(repeat, progress)
+    runs = []
+    for count in rows:
+        print(f"{count} connections", file=progress)
+        started = time.perf_counter()
+        data = synthetic_export(count, seed=seed, encoding=encoding)
+        generated = time.perf_counter() - started
+        runs.append({
+            "rows": count,
+            "bytes": len(data),
+            "generate_seconds": round(generated, 6),
+            "stages": benchmark_export(data, repeat, sample_size, progress),
+        })
+    return {
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "environment": environment(),
+        "repeat": repeat,
+        "sample_size": sample_size,
+        "seed": seed,
+        "encoding": encoding,
+        "imports": imports,
+        "runs": runs,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m linkedin_network.benchmark",
+        description="Time each processing stage on synthetic LinkedIn exports.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="export sizes to benchmark (default: 1000 10000 100000)")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="JSON report (default: benchmark.json)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"timed runs per stage; the best is reported (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--sample-size", type=int, default=DEFAULT_SAMPLE_SIZE,
+                        help=f"connections laid out and drawn (default: {DEFAULT_SAMPLE_SIZE})")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the exports (default: 0)")
+    parser.add_argument("--encoding", choices=ENCODINGS, default="utf-8", help="export encoding (default: utf-8)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.rows, args.repeat, args.sample_size, args.seed, args.encoding)
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump(report, output, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""Columnar model of a LinkedIn network: one row per connection.
+
+The connection table replaces the per-row dicts the app used to build. It is
+produced with vectorized string operations and has these columns:
+
+``node_id``           stable integer node ID (see ``node_ids``)
+``name``              display name (not necessarily unique)
+``title``             position (categorical, "Professional" when missing)
+``company``           company (categorical, "Unknown Company" when missing)
+``email``, ``url``    contact details, "" when missing
+``raw_connected_on``  the original "Connected On" text, "" when missing
+``connected_at``      parsed connection date (``NaT`` unless parsed)
+``connected_epoch``   ``connected_at`` in seconds since the epoch (NaN unless parsed)
+``date_status``       "parsed", "missing" or "unparseable"
+``connected_on``      connection date for display
+``industry``          estimated industry (categorical, see ``industry.INDUSTRIES``)
+
+"Connected On" is parsed exactly once here; everything else in the app reads
+``connected_at``/``connected_epoch`` instead of calling ``strptime``.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .industry import classify_industries
+
+# Node ID of the "You" hub; connection IDs are never 0
+HUB_ID = 0
+
+# Node IDs fit in 53 bits so they survive a round trip through JavaScript numbers
+NODE_ID_BITS = 53
+
+UNKNOWN_COMPANY = "Unknown Company"
+DEFAULT_POSITION = "Professional"
+
+# LinkedIn's format for "Connected On", e.g. "27 Aug 2010"
+CONNECTED_ON_FORMAT = '%d %b %Y'
+DISPLAY_DATE_FORMAT = '%B %d, %Y'
+
+# Values of the date_status column
+DATE_PARSED = "parsed"
+DATE_MISSING = "missing"
+DATE_UNPARSEABLE = "unparseable"
+DATE_STATUSES = [DATE_PARSED, DATE_MISSING, DATE_UNPARSEABLE]
+
+# Columns taken from the export as text; the other columns are derived from them
+TEXT_COLUMNS = ['node_id', 'name', 'title', 'company', 'email', 'url', 'raw_connected_on']
+
+# Granularities of the company timeline and their pandas period frequencies
+TIMELINE_GRANULARITIES = {"Year": "Y", "Quarter": "Q", "Month": "M"}
+
+
+def _clean_text(series, default=""):
+    # Strip whitespace and replace missing cells with a default
+    return series.astype('string').str.strip().fillna(default)
+
+
+def node_ids(url, raw):
+    """Stable integer node IDs for the rows of a raw export.
+
+    A connection's ID is a hash of its LinkedIn profile URL, so it stays the
+    same across exports; rows without a URL hash their raw cells instead.
+    Repeated keys (the same profile listed twice) are re-hashed with their
+    occurrence number until every ID is unique.
+    """
+    keys = pd.util.hash_array(url.to_numpy(dtype=object))
+    no_url = (url == "").to_numpy(dtype=bool)
+    if no_url.any():
+        keys[no_url] = pd.util.hash_pandas_object(raw[no_url], index=False).to_numpy()
+    keys >>= np.uint64(64 - NODE_ID_BITS)
+
+    while True:
+        occurrence = pd.Series(keys).groupby(keys).cumcount().to_numpy()
+        repeated = (occurrence > 0) | (keys == HUB_ID)
+        if not repeated.any():
+            return keys.astype(np.int64)
+        salted = [f"{key}:{count}" for key, count in zip(keys[repeated], occurrence[repeated])]
+        keys[repeated] = pd.util.hash_array(np.array(salted, dtype=object)) >> np.uint64(64 - NODE_ID_BITS)
+
+
+def parse_connected_on(raw_connected_on):
+    """Parse cleaned "Connected On" text in one vectorized pass.
+
+    Returns ``(connected_at, connected_epoch, date_status)``.
+    """
+    connected_at = pd.to_datetime(raw_connected_on, format=CONNECTED_ON_FORMAT, errors='coerce')
+    connected_epoch = (connected_at - pd.Timestamp(0)).dt.total_seconds()
+
+    parsed = connected_at.notna().to_numpy()
+    missing = (raw_connected_on == "").to_numpy(dtype=bool)
+    status = pd.Series(DATE_UNPARSEABLE, index=raw_connected_on.index)
+    status[parsed] = DATE_PARSED
+    status[missing] = DATE_MISSING
+    date_status = status.astype(pd.CategoricalDtype(DATE_STATUSES))
+    return connected_at, connected_epoch, date_status
+
+
+def clean_connections(df):
+    """The text columns of the connection table (``TEXT_COLUMNS``), cleaned but not parsed."""
+    first_name = _clean_text(df['First Name'])
+    last_name = _clean_text(df['Last Name'])
+
+    # Skip empty names
+    named = ((first_name != "") | (last_name != "")).to_numpy(dtype=bool)
+    first_name = first_name[named]
+    last_name = last_name[named]
+    raw = df.loc[named]
+
+    url = _clean_text(raw['URL'])
+    return pd.DataFrame({
+        'node_id': node_ids(url, raw),
+        'name': (first_name + " " + last_name).str.strip(),
+        'title': _clean_text(raw['Position'], DEFAULT_POSITION).astype('category'),
+        'company': _clean_text(raw['Company'], UNKNOWN_COMPANY).astype('category'),
+        'email': _clean_text(raw['Email Address']),
+        'url': url,
+        'raw_connected_on': _clean_text(raw['Connected On']),
+    }).reset_index(drop=True)
+
+
+def derive_columns(text):
+    """Add the parsed date and industry columns to the output of ``clean_connections``.
+
+    These are the expensive, row-by-row columns; they depend only on the
+    row's own text columns.
+    """
+    raw_connected_on = text['raw_connected_on']
+    connected_at, connected_epoch, date_status = parse_connected_on(raw_connected_on)
+
+    # Dates that fail to parse are shown as written in the export
+    connected_on = connected_at.dt.strftime(DISPLAY_DATE_FORMAT).fillna(raw_connected_on)
+
+    table = text.assign(connected_at=connected_at, connected_epoch=connected_epoch,
+                        date_status=date_status, connected_on=connected_on)
+    table['industry'] = classify_industries(table['company'], table['title'])
+    return table
+
+
+def build_connection_table(df):
+    """Build the connection table from a raw Connections.csv DataFrame."""
+    return derive_columns(clean_connections(df))
+
+
+def known_companies(table):
+    """Return the company column without "Unknown Company" rows."""
+    return table['company'][table['company'] != UNKNOWN_COMPANY]
+
+
+def known_company_counts(table):
+    """Connections per known company, most connected first."""
+    counts = known_companies(table).value_counts()
+    # value_counts on a categorical also reports unused categories
+    return counts[counts > 0]
+
+
+def company_members(table):
+    """Row positions of each company's connections, keyed by company.
+
+    Built once per upload so expanding a company never rescans the table.
+    """
+    return table.groupby('company', observed=True).indices
+
+
+def industry_counts(table):
+    """Connections per industry, in ``INDUSTRIES`` order, including empty ones."""
+    return table['industry'].value_counts(sort=False)
+
+
+def with_dates(table):
+    """Return the rows whose "Connected On" date was parsed."""
+    return table[table['date_status'] == DATE_PARSED]
+
+
+def oldest_connections(table, k):
+    """The ``k`` earliest dated connections, ties kept in row order."""
+    return with_dates(table).nsmallest(k, 'connected_epoch', keep='first')
+
+
+def newest_connections(table, k):
+    """The ``k`` most recent dated connections, ties kept in row order."""
+    return with_dates(table).nlargest(k, 'connected_epoch', keep='first')
+
+
+def stale_connections(table, years, per_company=3, now=None):
+    """Known-company connections made more than ``years`` years before ``now``.
+
+    Returns ``(stale, counts)``: up to ``per_company`` of the oldest stale
+    connections of each company (oldest first, ties in row order), and the
+    number of stale connections per company, most first.
+    """
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    dated = with_dates(table)
+    stale = dated[(dated['connected_at'] < now - pd.DateOffset(years=years))
+                  & (dated['company'] != UNKNOWN_COMPANY)]
+    counts = stale['company'].value_counts()
+    counts = counts[counts > 0]
+    oldest_first = stale.sort_values('connected_epoch', kind='stable')
+    return oldest_first.groupby('company', observed=True).head(per_company), counts
+
+
+def _first_connected(table):
+    # Earliest dated connection of each known company
+    known = (table['date_status'] == DATE_PARSED) & (table['company'] != UNKNOWN_COMPANY)
+    return table.loc[known, ['company', 'connected_at']].groupby('company', observed=True)['connected_at'].min()
+
+
+def _last_connected(table):
+    # Latest dated connection of any company; the timeline runs up to it
+    return table.loc[table['date_status'] == DATE_PARSED, 'connected_at'].max()
+
+
+def _period_counts(first_connected, last_connected, freq):
+    first_seen = first_connected.dt.to_period(freq)
+    if first_seen.empty:
+        return pd.Series(0, index=pd.PeriodIndex([], freq=freq), name='count')
+    periods = pd.period_range(first_seen.min(), max(first_seen.max(), last_connected.to_period(freq)), freq=freq)
+    return first_seen.value_counts().reindex(periods, fill_value=0)
+
+
+def new_company_counts(table, freq):
+    """Companies first connected with in each period, oldest period first.
+
+    Each known company is counted once, in the period of its earliest dated
+    connection. Periods up to that of the last dated connection with no new
+    companies are included with a count of 0.
+    """
+    return _period_counts(_first_connected(table), _last_connected(table), freq)
+
+
+def company_timelines(table):
+    """``new_company_counts`` for every granularity in ``TIMELINE_GRANULARITIES``."""
+    first_connected = _first_connected(table)
+    last_connected = _last_connected(table)
+    return {granularity: _period_counts(first_connected, last_connected, freq)
+            for granularity, freq in TIMELINE_GRANULARITIES.items()}
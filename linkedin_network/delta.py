@@ -0,0 +1,116 @@
+"""Re-import a newer export by diffing it against the previous network.
+
+Monthly exports are nearly identical, so only the cheap text columns of the
+new file are cleaned in full. Rows are matched to the previous connection
+table on ``node_id``, which is derived from the profile URL; a matched row
+whose text columns are unchanged keeps its parsed date and industry, and only
+added or changed rows go through ``derive_columns``. Node IDs stay the same,
+so cached layouts and the seeded samples carry over to the new network.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .connections import clean_connections, derive_columns
+from .ingest import build_network, content_digest, read_connections_csv
+from .instrumentation import NULL_RECORDER
+
+# Text columns compared to tell whether a matched connection changed
+COMPARED_COLUMNS = ['name', 'title', 'company', 'email', 'raw_connected_on']
+
+# Columns whose categories come from the whole new export rather than the changed rows
+TEXT_CATEGORY_COLUMNS = ['title', 'company']
+
+
+@dataclass
+class NetworkDelta:
+    """What changed between two exports of the same network."""
+
+    # Rows of the new connection table that were not in the previous one
+    added: pd.DataFrame
+    # Rows of the previous connection table that are gone
+    removed: pd.DataFrame
+    # One row per changed field: ``node_id``, ``name``, ``field``, ``before``, ``after``
+    changes: pd.DataFrame
+    unchanged: int
+
+    @property
+    def changed_count(self):
+        return self.changes['node_id'].nunique()
+
+    @property
+    def is_empty(self):
+        return self.added.empty and self.removed.empty and self.changes.empty
+
+    def field_counts(self):
+        """Changed connections per field, most first."""
+        return self.changes['field'].value_counts()
+
+
+def _field_changes(node_ids, names, field, before, after):
+    return pd.DataFrame({'node_id': node_ids, 'name': names, 'field': field,
+                         'before': before.astype(str), 'after': after.astype(str)})
+
+
+def update_connection_table(previous, df):
+    """The connection table of the export ``df``, reusing rows of the ``previous`` table.
+
+    ``previous`` is a ``NetworkData``. Returns ``(connections, delta)``; the
+    table equals ``build_connection_table(df)``.
+    """
+    old = previous.connections
+    text = clean_connections(df)
+    old_positions = previous.node_index.get_indexer(text['node_id'])
+    matched = np.flatnonzero(old_positions >= 0)
+    matched_old = old_positions[matched]
+
+    changed = np.zeros(len(text), dtype=bool)
+    changes = []
+    for column in COMPARED_COLUMNS:
+        before = old[column].to_numpy(dtype=object)[matched_old]
+        after = text[column].to_numpy(dtype=object)[matched]
+        differs = before != after
+        changed[matched[differs]] = True
+        changes.append(_field_changes(text['node_id'].to_numpy()[matched[differs]],
+                                      text['name'].to_numpy(dtype=object)[matched[differs]],
+                                      column, before[differs], after[differs]))
+
+    # Parse and classify only the rows that are new or differ
+    affected = changed.copy()
+    affected[old_positions < 0] = True
+    fresh = text[affected].copy()
+    for column in TEXT_CATEGORY_COLUMNS:
+        fresh[column] = fresh[column].cat.remove_unused_categories()
+    fresh = derive_columns(fresh)
+
+    kept = np.flatnonzero(~affected)
+    reused = old.iloc[old_positions[kept]].set_axis(kept)
+    connections = pd.concat([reused, fresh]).sort_index()
+    for column in TEXT_CATEGORY_COLUMNS:
+        connections[column] = text[column]
+
+    gone = np.ones(len(old), dtype=bool)
+    gone[matched_old] = False
+    delta = NetworkDelta(added=connections[old_positions < 0].reset_index(drop=True),
+                         removed=old[gone].reset_index(drop=True),
+                         changes=pd.concat(changes, ignore_index=True),
+                         unchanged=len(kept))
+    return connections, delta
+
+
+def update_network(previous, uploaded_file, digest=None, recorder=NULL_RECORDER):
+    """Ingest a newer export of the ``previous`` network.
+
+    Returns ``(network, delta)``. Raises ``MissingColumnsError`` if the file
+    is not a Connections.csv export.
+    """
+    if digest is None:
+        digest = content_digest(uploaded_file)
+    with recorder.stage("read CSV") as stage:
+        df = read_connections_csv(uploaded_file)
+        stage.rows = len(df)
+    with recorder.stage("connection table delta", rows=len(df)):
+        connections, delta = update_connection_table(previous, df)
+    return build_network(digest, df, connections, recorder), delta
@@ -0,0 +1,97 @@
+"""Export the connection table as NDJSON, Parquet or CSV.
+
+The writers encode rows chunk by chunk straight from the columnar table:
+the text formats encode one chunk at a time and Parquet writes one row group
+per chunk. Written to a file, as the batch ``--export`` option does, the
+working memory is bounded by ``EXPORT_CHUNK_ROWS`` rather than by the
+network size. ``export_bytes``, behind the app's download button, collects
+the chunks in memory, so it holds the whole file. Statistics are exported
+separately as a small JSON document.
+"""
+
+import io
+import json
+
+import pyarrow as pa
+
+from .stats import network_statistics
+
+# Format name -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "NDJSON": ("ndjson", "application/x-ndjson"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "CSV": ("csv", "text/csv"),
+}
+
+EXPORT_CHUNK_ROWS = 50_000
+
+# Exported columns; ``connected_at`` is written as ``connected_on``
+EXPORT_COLUMNS = ['node_id', 'name', 'title', 'company', 'industry', 'email', 'url',
+                  'connected_at', 'raw_connected_on', 'date_status']
+
+
+def export_table(connections):
+    """The exported columns of the connection table."""
+    return connections[EXPORT_COLUMNS].rename(columns={'connected_at': 'connected_on'})
+
+
+def _chunks(table, chunk_rows):
+    # Consecutive row slices of at most ``chunk_rows`` rows
+    for start in range(0, len(table), chunk_rows):
+        yield table.iloc[start:start + chunk_rows]
+
+
+def _text_chunk(chunk):
+    # Dates as plain ISO days; undated rows stay empty
+    chunk = chunk.copy()
+    chunk['connected_on'] = chunk['connected_on'].dt.strftime('%Y-%m-%d')
+    return chunk
+
+
+def write_ndjson(connections, fileobj, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write one JSON object per connection to the binary ``fileobj``."""
+    for chunk in _chunks(export_table(connections), chunk_rows):
+        if len(chunk):
+            # Each chunk ends with a newline already
+            fileobj.write(_text_chunk(chunk).to_json(orient='records', lines=True, force_ascii=False).encode('utf-8'))
+
+
+def write_csv(connections, fileobj, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write the connections as UTF-8 CSV with a header row to the binary ``fileobj``."""
+    table = export_table(connections)
+    # An empty table still gets its header
+    for start in range(0, max(len(table), 1), chunk_rows):
+        chunk = table.iloc[start:start + chunk_rows]
+        fileobj.write(_text_chunk(chunk).to_csv(index=False, header=start == 0).encode('utf-8'))
+
+
+def write_parquet(connections, fileobj, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write the connections as Parquet, one row group per chunk, to the binary ``fileobj``."""
+    # Loaded on the first Parquet export rather than with the app
+    import pyarrow.parquet as pq
+
+    table = export_table(connections)
+    schema = pa.Schema.from_pandas(table, preserve_index=False)
+    with pq.ParquetWriter(fileobj, schema) as writer:
+        for chunk in _chunks(table, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+EXPORT_WRITERS = {"NDJSON": write_ndjson, "Parquet": write_parquet, "CSV": write_csv}
+
+
+def write_export(connections, export_format, fileobj, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write ``connections`` to ``fileobj`` in one of ``EXPORT_FORMATS``."""
+    EXPORT_WRITERS[export_format](connections, fileobj, chunk_rows)
+
+
+def export_bytes(connections, export_format):
+    """The whole export of ``connections`` as bytes, for a download button."""
+    buffer = io.BytesIO()
+    write_export(connections, export_format, buffer)
+    return buffer.getvalue()
+
+
+def statistics_json(network):
+    """``network_statistics`` as an indented JSON document."""
+    return json.dumps(network_statistics(network), indent=2)
@@ -0,0 +1,87 @@
+"""Sidebar filters over the connection table as precomputed boolean masks.
+
+Each control (company, email availability, connection date range) maps to
+a boolean mask over the table rows. Masks are built from indexes prepared
+once per upload and kept in a small LRU cache, so changing one control
+costs at most one new mask plus a vectorized AND of the three.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+ALL = "All"
+EMAIL_FILTERS = [ALL, "With Email", "Without Email"]
+
+# Masks kept per upload; each is one byte per connection
+FILTER_CACHE_ENTRIES = 64
+
+
+class FilterIndex:
+    """Row masks for the sidebar filters of one connection table."""
+
+    def __init__(self, table, company_members):
+        self.size = len(table)
+        self.company_members = company_members
+        has_email = (table['email'] != "").to_numpy(dtype=bool)
+        self._email_masks = {ALL: None, "With Email": has_email, "Without Email": ~has_email}
+
+        # Dated rows in date order, so a date range is one contiguous slice
+        epochs = table['connected_epoch'].to_numpy(dtype=np.float64)
+        dated = np.flatnonzero(~np.isnan(epochs))
+        self._date_order = dated[np.argsort(epochs[dated], kind='stable')]
+        self._sorted_epochs = epochs[self._date_order]
+
+        self._masks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key, build):
+        with self._lock:
+            if key in self._masks:
+                self._masks.move_to_end(key)
+                return self._masks[key]
+        mask = build()
+        with self._lock:
+            self._masks[key] = mask
+            while len(self._masks) > FILTER_CACHE_ENTRIES:
+                self._masks.popitem(last=False)
+        return mask
+
+    def _rows_mask(self, rows):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def company_mask(self, company):
+        """Rows at ``company``; ``None`` (no filter) for "All"."""
+        if company == ALL:
+            return None
+        rows = self.company_members.get(company, np.zeros(0, dtype=np.int64))
+        return self._cached(('company', company), lambda: self._rows_mask(rows))
+
+    def email_mask(self, email_filter):
+        """Rows matching one of ``EMAIL_FILTERS``; ``None`` for "All"."""
+        return self._email_masks[email_filter]
+
+    def date_mask(self, start=None, end=None):
+        """Rows connected between ``start`` and ``end`` inclusive; ``None`` without a range.
+
+        Rows without a parsed date never fall inside a range.
+        """
+        if start is None or end is None:
+            return None
+        lo_epoch = (pd.Timestamp(start) - pd.Timestamp(0)).total_seconds()
+        hi_epoch = (pd.Timestamp(end) + pd.Timedelta(days=1) - pd.Timestamp(0)).total_seconds()
+        lo, hi = np.searchsorted(self._sorted_epochs, [lo_epoch, hi_epoch], side='left')
+        return self._cached(('date', lo, hi), lambda: self._rows_mask(self._date_order[lo:hi]))
+
+    def combine(self, company=ALL, email_filter=ALL, date_range=None):
+        """Mask of rows passing every active filter, or ``None`` if none is active."""
+        start, end = date_range if date_range else (None, None)
+        masks = [mask for mask in (self.company_mask(company), self.email_mask(email_filter),
+                                   self.date_mask(start, end)) if mask is not None]
+        if not masks:
+            return None
+        return np.logical_and.reduce(masks) if len(masks) > 1 else masks[0]
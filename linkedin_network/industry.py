@@ -0,0 +1,57 @@
+"""Keyword-based industry estimate for each connection.
+
+A connection belongs to the first industry, in ``INDUSTRY_KEYWORDS`` order,
+with a keyword that appears in its company or title; otherwise "Other".
+All keyword lists are compiled into a single regex whose alternatives are
+tried in priority order, and it only runs over the distinct companies and
+titles, which are far fewer than the rows.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Industries in priority order, with the keywords that suggest them
+INDUSTRY_KEYWORDS = {
+    'Technology': ['tech', 'software', 'engineer', 'developer', 'data', 'cloud', 'ai', 'ml'],
+    'Finance': ['bank', 'financial', 'investment', 'capital', 'fund', 'analyst'],
+    'Healthcare': ['health', 'medical', 'pharma', 'clinical', 'bio', 'hospital'],
+    'Consulting': ['consulting', 'advisory', 'strategy', 'management'],
+    'Education': ['school', 'university', 'education', 'professor', 'teacher'],
+}
+OTHER_INDUSTRY = 'Other'
+INDUSTRIES = [*INDUSTRY_KEYWORDS, OTHER_INDUSTRY]
+
+
+def _industry_pattern():
+    # One lookahead alternative per industry, anchored at the start: the
+    # first alternative that finds one of its keywords anywhere wins, so the
+    # match's group index is the industry's priority
+    alternatives = [
+        f"(?=.*?(?:{'|'.join(map(re.escape, keywords))}))()"
+        for keywords in INDUSTRY_KEYWORDS.values()
+    ]
+    return re.compile('^(?:' + '|'.join(alternatives) + ')', re.DOTALL)
+
+
+INDUSTRY_PATTERN = _industry_pattern()
+
+
+def industry_priorities(values):
+    """Priority (index into ``INDUSTRIES``) of each text in ``values``."""
+    priorities = np.full(len(values), len(INDUSTRIES) - 1, dtype=np.int8)
+    for position, value in enumerate(values):
+        match = INDUSTRY_PATTERN.match(value.lower())
+        if match:
+            priorities[position] = match.lastindex - 1
+    return priorities
+
+
+def classify_industries(companies, titles):
+    """Categorical industry for each row, from categorical company and title columns."""
+    company_priority = industry_priorities(companies.cat.categories.astype(str))
+    title_priority = industry_priorities(titles.cat.categories.astype(str))
+    codes = np.minimum(company_priority[companies.cat.codes.to_numpy()],
+                       title_priority[titles.cat.codes.to_numpy()])
+    return pd.Series(pd.Categorical.from_codes(codes, categories=INDUSTRIES), index=companies.index)
@@ -0,0 +1,242 @@
+"""Turn an uploaded Connections.csv into the connection table and a graph."""
+
+import codecs
+import hashlib
+from dataclasses import dataclass
+from functools import cached_property
+
+import pandas as pd
+import scipy.sparse as sp
+
+from .connections import HUB_ID, build_connection_table, company_members, company_timelines
+from .filters import FilterIndex
+from .instrumentation import NULL_RECORDER
+from .metrics import ego_adjacency
+from .sampling import Sampler
+from .search import SearchIndex
+
+# Expected columns of a LinkedIn Connections.csv export
+EXPECTED_COLUMNS = ['First Name', 'Last Name', 'URL', 'Email Address', 'Company', 'Position', 'Connected On']
+
+# Bytes inspected to detect the encoding and locate the header line
+SNIFF_BYTES = 64 * 1024
+
+# Byte order marks and the codec that reads the text after them
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+
+# Main person data (the user)
+MAIN_PERSON_DATA = {
+    "name": "You",
+    "type": "main",
+    "title": "Your Title",
+    "company": "Your Company",
+    "location": "Your Location",
+    "email": "your.email@company.com",
+    "experience": "Your experience",
+    "education": "Your education",
+    "skills": ["Your", "Skills"],
+    "connected_on": None,
+    "url": None
+}
+
+
+class MissingColumnsError(ValueError):
+    """Raised when the uploaded CSV lacks one of ``EXPECTED_COLUMNS``."""
+
+    def __init__(self, missing, found):
+        super().__init__(f"Missing columns in CSV: {', '.join(missing)}")
+        self.missing = missing
+        self.found = found
+
+
+@dataclass
+class NetworkData:
+    """Everything derived from one upload that survives Streamlit reruns."""
+
+    digest: str
+    df: pd.DataFrame
+    connections: pd.DataFrame
+    # Row position in ``connections`` of each node ID, via ``get_loc``
+    node_index: pd.Index
+    # CSR adjacency for metrics: node 0 is "You", node i + 1 is connection row i
+    adjacency: sp.csr_matrix
+    # Row positions in ``connections`` for each company
+    company_members: dict
+    # New companies per period, keyed by timeline granularity
+    company_timelines: dict
+    filter_index: FilterIndex
+    sampler: Sampler
+
+    @cached_property
+    def search_index(self):
+        # Built on the first search rather than on every load
+        return SearchIndex(self.connections)
+
+    def node_record(self, node_id):
+        """Attributes of a node for display, or ``None`` for an unknown ID."""
+        if node_id == HUB_ID:
+            return MAIN_PERSON_DATA
+        if node_id not in self.node_index:
+            return None
+        return {"type": "connection", **self.connections.iloc[self.node_index.get_loc(node_id)].to_dict()}
+
+
+def content_digest(uploaded_file):
+    """Return the SHA-256 hex digest of an uploaded file's bytes."""
+    return hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+
+
+def sniff_export(buffer, sniff_bytes=SNIFF_BYTES):
+    """Detect the encoding and header position of an export from its first bytes.
+
+    Returns ``(encoding, header_offset)`` where ``header_offset`` is the byte
+    offset of the "First Name" header line, or of the start of the data when
+    no header is found within the sniffed window.
+    """
+    buffer.seek(0)
+    head = buffer.read(sniff_bytes)
+
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            body_start = len(bom)
+            break
+    else:
+        body_start = 0
+        try:
+            # Incremental decoding tolerates a multi-byte character cut at the window edge
+            codecs.getincrementaldecoder('utf-8')().decode(head)
+            encoding = 'utf-8'
+        except UnicodeDecodeError:
+            encoding = 'latin-1'
+
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(head[body_start:])
+
+    # Find the header line (first line that starts with "First Name")
+    header_index = 0 if text.startswith('First Name') else text.find('\nFirst Name') + 1
+    if header_index <= 0:
+        return encoding, body_start
+    return encoding, body_start + len(text[:header_index].encode(encoding))
+
+
+def _read_export(uploaded_file, header_offset, encoding):
+    uploaded_file.seek(header_offset)
+    # Read with specific parameters to handle LinkedIn's format
+    return pd.read_csv(uploaded_file,
+                       encoding=encoding,
+                       dtype=str,
+                       quotechar='"',
+                       escapechar='\\',
+                       doublequote=True,
+                       skipinitialspace=True,
+                       on_bad_lines='skip')
+
+
+def read_connections_csv(uploaded_file):
+    """Read a LinkedIn export, handling encoding issues and the notes preamble.
+
+    The file is sniffed once, then parsed in a single streaming pass straight
+    from the uploaded buffer: no decoded copy of the whole file is built.
+    A file sniffed as UTF-8 whose first invalid byte lies past the sniffed
+    window is read a second time as Latin-1. Malformed rows are skipped.
+    """
+    encoding, header_offset = sniff_export(uploaded_file)
+    try:
+        df = _read_export(uploaded_file, header_offset, encoding)
+    except UnicodeDecodeError:
+        if not encoding.startswith('utf-8'):
+            raise
+        df = _read_export(uploaded_file, header_offset, 'latin-1')
+
+    # Clean column names - LinkedIn files might have leading/trailing spaces
+    df.columns = df.columns.str.strip()
+
+    missing_columns = [col for col in EXPECTED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise MissingColumnsError(missing_columns, df.columns.tolist())
+    return df
+
+
+class EgoGraph:
+    """The ego network of "You" and a set of connections.
+
+    Offers the part of the NetworkX graph interface the layouts read: node
+    iteration, ``nodes()``, ``edges()`` and neighbours by ``G[node]``.
+    NetworkX is imported only by ``to_networkx``, for its layout algorithms.
+    """
+
+    def __init__(self, node_ids):
+        self._nodes = [HUB_ID, *node_ids]
+        self._connections = set(node_ids)
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        return node == HUB_ID or node in self._connections
+
+    def __getitem__(self, node):
+        if node == HUB_ID:
+            return self._nodes[1:]
+        if node in self._connections:
+            return [HUB_ID]
+        raise KeyError(node)
+
+    def nodes(self):
+        return list(self._nodes)
+
+    def edges(self):
+        return [(HUB_ID, node) for node in self._nodes[1:]]
+
+    def to_networkx(self):
+        """The same graph as a ``networkx.Graph``, with nodes in the same order."""
+        import networkx as nx
+
+        G = nx.Graph()
+        G.add_node(HUB_ID)
+        G.add_edges_from(self.edges())
+        return G
+
+
+def build_graph(connections):
+    """Build the ego network of ``connections``, each linked to "You".
+
+    Nodes are the integer ``node_id`` values with ``HUB_ID`` for "You"; their
+    attributes stay in the connection table rather than in node dicts. Only
+    the connections on screen are turned into a graph for the layouts.
+    """
+    return EgoGraph(connections['node_id'].tolist())
+
+
+def build_network(digest, df, connections, recorder=NULL_RECORDER):
+    """``NetworkData`` for a raw export and its connection table, with its indexes."""
+    with recorder.stage("network indexes", rows=len(connections)):
+        members = company_members(connections)
+        return NetworkData(digest=digest, df=df, connections=connections,
+                           node_index=pd.Index(connections['node_id']),
+                           adjacency=ego_adjacency(len(connections)),
+                           company_members=members,
+                           company_timelines=company_timelines(connections),
+                           filter_index=FilterIndex(connections, members),
+                           sampler=Sampler(connections))
+
+
+def load_network(uploaded_file, digest=None, recorder=NULL_RECORDER):
+    """Run the full ingest stage for one upload, timing its steps in ``recorder``.
+
+    Raises ``MissingColumnsError`` if the file is not a Connections.csv export.
+    """
+    if digest is None:
+        digest = content_digest(uploaded_file)
+    with recorder.stage("read CSV") as stage:
+        df = read_connections_csv(uploaded_file)
+        stage.rows = len(df)
+    with recorder.stage("connection table", rows=len(df)):
+        connections = build_connection_table(df)
+    return build_network(digest, df, connections, recorder)
@@ -0,0 +1,175 @@
+"""Wall time, row counts and memory peaks of the stages of one rerun.
+
+Pipeline code wraps each stage in ``recorder.stage(name)``. A disabled
+recorder hands out one shared no-op stage, so instrumentation costs a method
+call per stage when nobody is looking. Memory is traced with ``tracemalloc``
+only when asked for, since tracing slows allocation-heavy stages down.
+Stages may nest; a stage's peak covers its children.
+
+Tracing is process-wide and shared by every session: a trace started by a
+recorder runs until the last recorder tracing memory finishes, and recorders
+that do not trace memory leave it alone. A stage during which the trace was
+stopped or restarted reports no peak rather than a wrong one.
+"""
+
+import threading
+import time
+import tracemalloc
+import weakref
+from datetime import datetime
+
+# Recorders tracing memory right now; weak so an abandoned rerun cannot keep the trace alive
+_tracing_recorders = weakref.WeakSet()
+# Whether the running trace was started by a recorder, and how many traces recorders started
+_owns_tracing = False
+_trace_generation = 0
+_tracing_lock = threading.Lock()
+
+
+class Stage:
+    """One timed stage; set ``rows`` inside the ``with`` block to record its size."""
+
+    __slots__ = ('recorder', 'name', 'rows', 'depth', 'seconds', 'peak_bytes', '_started', '_start_bytes', '_peak',
+                 '_generation')
+
+    def __init__(self, recorder, name, rows=None):
+        self.recorder = recorder
+        self.name = name
+        self.rows = rows
+        self.depth = 0
+        self.seconds = None
+        self.peak_bytes = None
+
+    def __enter__(self):
+        self.recorder._enter(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder._exit(self)
+        return False
+
+    def as_dict(self):
+        return {
+            "stage": self.name,
+            "depth": self.depth,
+            "seconds": round(self.seconds, 6),
+            "rows": self.rows,
+            "peak_mb": None if self.peak_bytes is None else round(self.peak_bytes / 1e6, 3),
+        }
+
+
+def _start_tracing(recorder):
+    # Join the running trace, or start one if nobody traces
+    global _owns_tracing, _trace_generation
+    with _tracing_lock:
+        _tracing_recorders.add(recorder)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _owns_tracing = True
+            _trace_generation += 1
+
+
+def _stop_tracing(recorder):
+    # Leave the trace; the last recorder out stops a trace that a recorder started
+    global _owns_tracing
+    with _tracing_lock:
+        _tracing_recorders.discard(recorder)
+        if _owns_tracing and not _tracing_recorders:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            _owns_tracing = False
+
+
+def _tracing_generation():
+    # Identifies the running trace, or None when nothing traces
+    return _trace_generation if tracemalloc.is_tracing() else None
+
+
+class _NullStage:
+    # Shared stage of a disabled recorder; ``rows`` is accepted and dropped
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageRecorder:
+    """Records the stages of one rerun when ``enabled``."""
+
+    def __init__(self, enabled=False, trace_memory=False):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.stages = []
+        self._stack = []
+        self._started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._finished = None
+        if self.trace_memory:
+            _start_tracing(self)
+
+    def stage(self, name, rows=None):
+        """Context manager timing the stage ``name``."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return Stage(self, name, rows)
+
+    def _enter(self, stage):
+        stage.depth = len(self._stack)
+        self.stages.append(stage)
+        if self.trace_memory:
+            stage._generation = _tracing_generation()
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # Keep the parent's peak so far before resetting it for the child
+                self._stack[-1]._peak = max(self._stack[-1]._peak, peak)
+            tracemalloc.reset_peak()
+            stage._start_bytes = current
+            stage._peak = current
+        self._stack.append(stage)
+        stage._started = time.perf_counter()
+
+    def _exit(self, stage):
+        stage.seconds = time.perf_counter() - stage._started
+        self._stack.pop()
+        if self.trace_memory:
+            if stage._generation is None or stage._generation != _tracing_generation():
+                # The trace was stopped or restarted by other code during the stage
+                return
+            stage._peak = max(stage._peak, tracemalloc.get_traced_memory()[1])
+            # Tracing is process-wide, so other sessions can free memory during the stage
+            stage.peak_bytes = max(stage._peak - stage._start_bytes, 0)
+            if self._stack:
+                self._stack[-1]._peak = max(self._stack[-1]._peak, stage._peak)
+
+    def finish(self):
+        """Stop the clock and leave the memory trace; returns ``as_dict()``.
+
+        Calling it again returns the same report.
+        """
+        if self._finished is None:
+            self._finished = time.perf_counter()
+            if self.trace_memory:
+                _stop_tracing(self)
+        return self.as_dict()
+
+    def as_dict(self):
+        """The recorded stages, JSON-serializable."""
+        return {
+            "started_at": self._started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "total_seconds": round((self._finished or time.perf_counter()) - self._started, 6),
+            "trace_memory": self.trace_memory,
+            "stages": [stage.as_dict() for stage in self.stages if stage.seconds is not None],
+        }
+
+
+# Recorder used when the caller passes none
+NULL_RECORDER = StageRecorder()
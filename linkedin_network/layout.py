@@ -0,0 +1,437 @@
+"""Graph layouts with an LRU cache of node positions.
+
+Layouts are cached by the set of visible nodes, the algorithm and the node
+spacing, so reruns that only change labels or colours reuse the previous
+positions. When the visible nodes change, iterative layouts are warm-started
+from the cached entry that shares the most nodes, which keeps the picture
+stable and lets the layout settle in fewer iterations.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+LAYOUT_ALGORITHMS = ["Spring Layout", "Circular Layout", "Random Layout", "Kamada Kawai", "Fast Force-Directed",
+                     "Radial by Company"]
+# Scales to any view and needs no NetworkX, so the first render stays quick
+DEFAULT_LAYOUT = "Fast Force-Directed"
+
+# Algorithms run by NetworkX, which is imported the first time one is chosen
+NETWORKX_ALGORITHMS = {"Spring Layout", "Circular Layout", "Random Layout", "Kamada Kawai"}
+
+# Algorithms that can start from previous positions, and those that use node spacing
+WARM_START_ALGORITHMS = {"Spring Layout", "Kamada Kawai", "Fast Force-Directed"}
+SPACING_ALGORITHMS = {"Spring Layout", "Fast Force-Directed"}
+
+# Algorithms that stay fast on tens of thousands of nodes; the NetworkX force
+# layouts are limited to MAX_NETWORKX_LAYOUT_NODES visible connections
+SCALABLE_ALGORITHMS = {"Circular Layout", "Random Layout", "Fast Force-Directed", "Radial by Company"}
+
+# Algorithms that place nodes from their company and connection date
+ATTRIBUTE_ALGORITHMS = {"Radial by Company"}
+MAX_NETWORKX_LAYOUT_NODES = 1000
+
+SPRING_ITERATIONS = 50
+# Iterations for a warm start that already knows most node positions
+WARM_START_ITERATIONS = 20
+WARM_START_MIN_OVERLAP = 0.5
+
+LAYOUT_SEED = 42
+
+# Radial layout: inner radius left around the hub, and the share of each sector left empty
+RADIAL_INNER_RADIUS = 0.15
+RADIAL_SECTOR_GAP = 0.1
+GOLDEN_RATIO_FRACTION = (np.sqrt(5) - 1) / 2
+
+# Company overview: radius of the disc of members around an expanded company
+OVERVIEW_MIN_RADIUS = 0.05
+OVERVIEW_MAX_RADIUS = 0.3
+
+
+def _node_set_digest(nodes):
+    # Stable digest of a node set, independent of iteration order
+    hasher = hashlib.blake2b(digest_size=16)
+    for node in sorted(map(str, nodes)):
+        hasher.update(node.encode('utf-8'))
+        hasher.update(b'\x1f')
+    return hasher.hexdigest()
+
+
+def _node_data_digest(node_data):
+    hashes = pd.util.hash_pandas_object(node_data[['company', 'connected_epoch']], index=True)
+    return hashlib.blake2b(hashes.to_numpy().tobytes(), digest_size=16).hexdigest()
+
+
+class NodePositions:
+    """Coordinates of a layout: node ids and an ``(n, 2)`` array in the same order.
+
+    Layouts return their nodes in graph order, which for an ``EgoGraph`` is
+    ``[HUB_ID, *node_ids]``, so the figure takes ``xy`` as is. Other node
+    orders are looked up all at once with ``take``.
+    """
+
+    __slots__ = ('nodes', 'xy', '_index')
+
+    def __init__(self, nodes, xy):
+        self.nodes = np.asarray(nodes)
+        self.xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        self._index = None
+
+    @classmethod
+    def from_dict(cls, positions):
+        """Positions from a ``{node: (x, y)}`` dict, such as a NetworkX layout."""
+        return cls(list(positions), np.array(list(positions.values()), dtype=np.float64))
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = pd.Index(self.nodes)
+        return self._index
+
+    def take(self, nodes):
+        """``(len(nodes), 2)`` coordinates of ``nodes``; raises ``KeyError`` for unknown nodes."""
+        nodes = np.asarray(nodes)
+        if np.array_equal(nodes, self.nodes):
+            return self.xy
+        rows = self.index.get_indexer(nodes)
+        if (rows < 0).any():
+            raise KeyError(nodes[rows < 0].tolist())
+        return self.xy[rows]
+
+    def to_dict(self):
+        """``{node: (x, y)}``, as NetworkX layouts take for their starting positions."""
+        return dict(zip(self.nodes.tolist(), self.xy))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes.tolist())
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def __getitem__(self, node):
+        return self.xy[self.index.get_loc(node)]
+
+
+class LayoutCache:
+    """Thread-safe LRU cache of layouts keyed by node set, algorithm and spacing."""
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(nodes, algorithm, spacing, node_data=None):
+        # Spacing only invalidates layouts for algorithms that use it
+        if algorithm not in SPACING_ALGORITHMS:
+            spacing = None
+        if algorithm in ATTRIBUTE_ALGORITHMS and node_data is not None:
+            # Same people at different companies or dates need a different layout
+            algorithm = (algorithm, _node_data_digest(node_data))
+        return (_node_set_digest(nodes), algorithm, spacing)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, positions):
+        with self._lock:
+            self._entries[key] = positions
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def closest(self, nodes, algorithm, spacing):
+        """Return the cached positions sharing the most nodes, and that share."""
+        spacing = spacing if algorithm in SPACING_ALGORITHMS else None
+        nodes = pd.Index(nodes).unique()
+        best, best_overlap = None, 0
+        with self._lock:
+            candidates = [
+                positions for (_, cached_algorithm, cached_spacing), positions in self._entries.items()
+                if cached_algorithm == algorithm and cached_spacing == spacing
+            ]
+        for positions in candidates:
+            overlap = int(positions.index.isin(nodes).sum())
+            if overlap > best_overlap:
+                best, best_overlap = positions, overlap
+        return best, (best_overlap / len(nodes) if len(nodes) else 0.0)
+
+    def items(self):
+        """``(key, positions)`` pairs, least recently used first."""
+        with self._lock:
+            return list(self._entries.items())
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _cloud_in_cell(positions, origin, cell, grid_size):
+    # Flat indices and weights of the four grid points around each position
+    scaled = (positions - origin) / cell
+    base = np.clip(np.floor(scaled).astype(np.int64), 0, grid_size - 2)
+    frac = np.clip(scaled - base, 0.0, 1.0)
+    indices, weights = [], []
+    for dx in (0, 1):
+        for dy in (0, 1):
+            wx = frac[:, 0] if dx else 1.0 - frac[:, 0]
+            wy = frac[:, 1] if dy else 1.0 - frac[:, 1]
+            indices.append((base[:, 0] + dx) * grid_size + base[:, 1] + dy)
+            weights.append(wx * wy)
+    return indices, weights
+
+
+def _repulsion_kernels(grid_size):
+    # FFTs of the unit-spacing kernel r / |r|^2 on a zero-padded periodic grid
+    padded = 2 * grid_size
+    offsets = np.arange(padded)
+    offsets = np.where(offsets < grid_size, offsets, offsets - padded).astype(np.float64)
+    a, b = np.meshgrid(offsets, offsets, indexing='ij')
+    r2 = a * a + b * b
+    r2[0, 0] = np.inf
+    return np.fft.rfft2(a / r2), np.fft.rfft2(b / r2)
+
+
+def force_directed_positions(n, sources, targets, spacing=1.0, iterations=SPRING_ITERATIONS,
+                             initial=None, grid_size=None, seed=LAYOUT_SEED):
+    """Fruchterman-Reingold layout of ``n`` nodes with grid-approximated repulsion.
+
+    Attraction runs over the edge arrays ``sources``/``targets``. Repulsion is
+    computed with a particle-mesh scheme: node mass is spread onto a grid,
+    convolved with the ``k^2 / d`` force kernel by FFT and interpolated back,
+    so each iteration costs O(n + g^2 log g) instead of O(n^2). ``spacing``
+    scales the optimal node distance ``k = spacing / sqrt(n)``.
+
+    Returns an ``(n, 2)`` array scaled to [-1, 1].
+    """
+    if n == 0:
+        return np.zeros((0, 2))
+    if n == 1:
+        return np.zeros((1, 2))
+
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(0, 1, size=(n, 2)) if initial is None else np.array(initial, dtype=np.float64)
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+
+    if grid_size is None:
+        grid_size = int(np.clip(2 * np.sqrt(n), 32, 256))
+    kernel_x, kernel_y = _repulsion_kernels(grid_size)
+    padded = 2 * grid_size
+
+    k = spacing / np.sqrt(n)
+    extent = np.ptp(positions, axis=0).max() or 1.0
+    temperature = 0.1 * extent
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        # Repulsion: deposit node mass on the grid, convolve, interpolate back
+        origin = positions.min(axis=0)
+        extent = np.ptp(positions, axis=0).max() or 1.0
+        cell = extent * 1.001 / (grid_size - 1)
+        indices, weights = _cloud_in_cell(positions, origin, cell, grid_size)
+
+        density = np.zeros(grid_size * grid_size)
+        for index, weight in zip(indices, weights):
+            density += np.bincount(index, weights=weight, minlength=grid_size * grid_size)
+        density_fft = np.fft.rfft2(density.reshape(grid_size, grid_size), s=(padded, padded))
+        field_x = np.fft.irfft2(density_fft * kernel_x, s=(padded, padded))[:grid_size, :grid_size].ravel()
+        field_y = np.fft.irfft2(density_fft * kernel_y, s=(padded, padded))[:grid_size, :grid_size].ravel()
+
+        displacement = np.zeros((n, 2))
+        for index, weight in zip(indices, weights):
+            displacement[:, 0] += field_x[index] * weight
+            displacement[:, 1] += field_y[index] * weight
+        displacement *= k * k / cell
+
+        # Attraction along edges with magnitude d^2 / k
+        if len(sources):
+            delta = positions[targets] - positions[sources]
+            pull = delta * (np.linalg.norm(delta, axis=1, keepdims=True) / k)
+            for axis in (0, 1):
+                displacement[:, axis] += np.bincount(sources, weights=pull[:, axis], minlength=n)
+                displacement[:, axis] -= np.bincount(targets, weights=pull[:, axis], minlength=n)
+
+        # Move each node at most the current temperature
+        length = np.linalg.norm(displacement, axis=1, keepdims=True)
+        length[length == 0] = 1.0
+        positions += displacement / length * np.minimum(length, temperature)
+        temperature -= cooling
+
+    positions -= positions.mean(axis=0)
+    scale = np.abs(positions).max()
+    return positions / scale if scale > 0 else positions
+
+
+def fast_force_layout(G, spacing, initial=None, iterations=SPRING_ITERATIONS):
+    """``NodePositions`` for ``G`` from ``force_directed_positions``."""
+    nodes = list(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    start = None if initial is None else initial.take(nodes)
+    positions = force_directed_positions(len(nodes), edges[:, 0], edges[:, 1], spacing=spacing,
+                                         iterations=iterations, initial=start)
+    return NodePositions(nodes, positions)
+
+
+def radial_company_positions(companies, connected_epoch):
+    """Closed-form sector layout of connections around a hub at the origin.
+
+    Each company gets an angular sector sized by its number of connections,
+    largest first. Inside a sector members are ordered by connection date,
+    oldest nearest the hub, and spread over the wedge in a sunflower pattern
+    so the sector fills evenly. Runs in O(n log n) for the sort, with no
+    iterations. Returns an ``(n, 2)`` array within the unit circle.
+    """
+    n = len(companies)
+    if n == 0:
+        return np.zeros((0, 2))
+
+    codes = pd.Categorical(companies).codes.astype(np.int64) + 1
+    counts = np.bincount(codes)
+
+    # Sector start, as a share of all connections, for companies ordered by size
+    by_size = np.argsort(-counts, kind='stable')
+    sector_start = np.empty(len(counts))
+    sector_start[by_size] = np.cumsum(counts[by_size]) - counts[by_size]
+
+    # Rank of each connection by date within its company, undated last
+    dates = np.nan_to_num(np.asarray(connected_epoch, dtype=np.float64), nan=np.inf)
+    order = np.lexsort((dates, codes))
+    group_first = np.cumsum(counts) - counts
+    rank = np.empty(n)
+    rank[order] = np.arange(n) - group_first[codes[order]]
+
+    size = counts[codes]
+    within = RADIAL_SECTOR_GAP / 2 + (1 - RADIAL_SECTOR_GAP) * ((rank * GOLDEN_RATIO_FRACTION) % 1)
+    theta = 2 * np.pi * (sector_start[codes] + size * within) / n
+    radius = RADIAL_INNER_RADIUS + (1 - RADIAL_INNER_RADIUS) * np.sqrt((rank + 0.5) / size)
+    return np.column_stack([radius * np.cos(theta), radius * np.sin(theta)])
+
+
+def radial_company_layout(G, node_data):
+    """``NodePositions`` for ``G`` from ``radial_company_positions``.
+
+    ``node_data`` is indexed by node and has ``company`` and ``connected_epoch``
+    columns; nodes without a row (the ``HUB_ID`` hub) sit at the centre.
+    """
+    nodes = pd.Index(list(G))
+    node_data = node_data[node_data.index.isin(nodes)]
+    xy = np.zeros((len(nodes), 2))
+    xy[nodes.get_indexer(node_data.index)] = radial_company_positions(
+        node_data['company'].to_numpy(), node_data['connected_epoch'].to_numpy())
+    return NodePositions(nodes, xy)
+
+
+def sunflower_positions(count, radius):
+    """``count`` points spread evenly over a disc of ``radius`` around the origin."""
+    j = np.arange(count)
+    r = radius * np.sqrt((j + 0.5) / max(count, 1))
+    theta = 2 * np.pi * GOLDEN_RATIO_FRACTION * j
+    return np.column_stack([r * np.cos(theta), r * np.sin(theta)])
+
+
+def company_overview_positions(member_counts, expanded):
+    """Positions for company super-nodes around the hub and for expanded members.
+
+    ``member_counts`` lists connections per company, largest first; super-nodes
+    sit on the unit circle in that order. ``expanded`` holds the positions
+    (into ``member_counts``) of expanded companies, whose members are spread
+    over a disc around their super-node. Returns ``(super_xy, {position: members_xy})``.
+    """
+    member_counts = np.asarray(member_counts, dtype=np.float64)
+    theta = 2 * np.pi * np.arange(len(member_counts)) / max(len(member_counts), 1)
+    super_xy = np.column_stack([np.cos(theta), np.sin(theta)])
+
+    largest = member_counts.max() if len(member_counts) else 1.0
+    members_xy = {}
+    for position in expanded:
+        radius = OVERVIEW_MIN_RADIUS + OVERVIEW_MAX_RADIUS * np.sqrt(member_counts[position] / largest)
+        members_xy[position] = super_xy[position] + sunflower_positions(int(member_counts[position]), radius)
+    return super_xy, members_xy
+
+
+def warm_start_positions(G, previous, seed=LAYOUT_SEED):
+    """Initial positions for ``G``: reuse ``previous`` and place new nodes near their neighbours."""
+    rng = np.random.default_rng(seed)
+    nodes = list(G)
+    rows = previous.index.get_indexer(nodes)
+    placed = rows >= 0
+    xy = np.zeros((len(nodes), 2))
+    xy[placed] = previous.xy[rows[placed]]
+    row = {node: i for i, node in enumerate(nodes)}
+    for i in np.flatnonzero(~placed):
+        anchors = [xy[row[neighbor]] for neighbor in G[nodes[i]] if placed[row[neighbor]]]
+        if anchors:
+            xy[i] = np.mean(anchors, axis=0) + rng.normal(scale=0.1, size=2)
+        else:
+            xy[i] = rng.uniform(-1, 1, size=2)
+        placed[i] = True
+    return NodePositions(nodes, xy)
+
+
+def _networkx_layout(G, algorithm, spacing, initial, iterations):
+    import networkx as nx
+
+    if hasattr(G, 'to_networkx'):
+        G = G.to_networkx()
+    initial = None if initial is None else initial.to_dict()
+    if algorithm == "Spring Layout":
+        positions = nx.spring_layout(G, k=spacing, pos=initial, iterations=iterations, seed=LAYOUT_SEED)
+    elif algorithm == "Circular Layout":
+        positions = nx.circular_layout(G)
+    elif algorithm == "Random Layout":
+        positions = nx.random_layout(G, seed=LAYOUT_SEED)
+    else:
+        positions = nx.kamada_kawai_layout(G, pos=initial)
+    return NodePositions.from_dict(positions)
+
+
+def run_layout(G, algorithm, spacing, initial=None, iterations=SPRING_ITERATIONS, node_data=None):
+    """Compute ``NodePositions`` for ``G`` without consulting the cache.
+
+    ``node_data`` supplies node attributes for the algorithms in
+    ``ATTRIBUTE_ALGORITHMS``.
+    """
+    if algorithm in NETWORKX_ALGORITHMS:
+        return _networkx_layout(G, algorithm, spacing, initial, iterations)
+    if algorithm == "Fast Force-Directed":
+        return fast_force_layout(G, spacing, initial=initial, iterations=iterations)
+    if algorithm == "Radial by Company":
+        if node_data is None:
+            raise ValueError("Radial by Company layout needs node data")
+        return radial_company_layout(G, node_data)
+    raise ValueError(f"Unknown layout algorithm: {algorithm}")
+
+
+def compute_layout(G, algorithm, spacing, cache=None, node_data=None):
+    """Return ``NodePositions`` for ``G``, reusing and warm-starting from ``cache``."""
+    if cache is None:
+        return run_layout(G, algorithm, spacing, node_data=node_data)
+
+    key = cache.key(G.nodes(), algorithm, spacing, node_data=node_data)
+    positions = cache.get(key)
+    if positions is not None:
+        return positions
+
+    initial, iterations = None, SPRING_ITERATIONS
+    if algorithm in WARM_START_ALGORITHMS:
+        previous, overlap = cache.closest(G.nodes(), algorithm, spacing)
+        if previous is not None:
+            initial = warm_start_positions(G, previous)
+            if overlap >= WARM_START_MIN_OVERLAP:
+                iterations = WARM_START_ITERATIONS
+
+    positions = run_layout(G, algorithm, spacing, initial=initial, iterations=iterations, node_data=node_data)
+    cache.put(key, positions)
+    return positions
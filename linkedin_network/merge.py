@@ -0,0 +1,95 @@
+"""Several exports merged into one network with a hub per uploader.
+
+People are matched across exports by ``node_id``, which is derived from the
+profile URL, so someone in three colleagues' networks is one node linked to
+three hubs. The graph is kept as a SciPy sparse adjacency matrix in CSR form
+and never goes through NetworkX. Nodes ``0 .. len(owners) - 1`` are the
+hubs; node ``len(owners) + i`` is row ``i`` of ``people``.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# Columns kept for each person, taken from their first export
+PERSON_COLUMNS = ['node_id', 'name', 'title', 'company', 'url']
+
+# People drawn in the merged graph, most shared first
+MERGED_VIEW_PEOPLE = 2000
+
+
+@dataclass
+class MergedNetwork:
+    """People from several exports, linked to the hubs of their uploaders."""
+
+    owners: list
+    people: pd.DataFrame
+    # Symmetric hub/person adjacency over ``len(owners) + len(people)`` nodes
+    adjacency: sp.csr_matrix
+    # Hub-by-person incidence; row ``h`` holds hub ``h``'s connections
+    membership: sp.csr_matrix
+
+    @property
+    def hub_count(self):
+        return len(self.owners)
+
+    @property
+    def edge_count(self):
+        return self.adjacency.nnz // 2
+
+    def shared_people(self, min_owners=2):
+        """Rows of ``people`` in at least ``min_owners`` networks, most shared first."""
+        shared = self.people[self.people['owner_count'] >= min_owners]
+        return shared.sort_values('owner_count', ascending=False, kind='stable')
+
+    def overlap(self):
+        """Connections shared by each pair of uploaders; the diagonal is each network's size."""
+        counts = (self.membership @ self.membership.T).toarray()
+        return pd.DataFrame(counts, index=self.owners, columns=self.owners)
+
+    def view_nodes(self, max_people=MERGED_VIEW_PEOPLE):
+        """Every hub plus up to ``max_people`` people, the most shared first."""
+        order = np.argsort(-self.people['owner_count'].to_numpy(), kind='stable')[:max_people]
+        return np.concatenate([np.arange(self.hub_count), self.hub_count + order])
+
+    def subgraph_edges(self, nodes):
+        """Edges among ``nodes`` as ``(sources, targets)`` positions into ``nodes``, each once."""
+        sub = self.adjacency[nodes][:, nodes]
+        upper = sp.triu(sub, k=1).tocoo()
+        return upper.row, upper.col
+
+
+def owner_labels(file_names):
+    """Hub labels from upload file names; repeated names get " (2)", " (3)", ..."""
+    labels, seen = [], {}
+    for file_name in file_names:
+        stem = file_name.rsplit('.', 1)[0]
+        seen[stem] = seen.get(stem, 0) + 1
+        labels.append(stem if seen[stem] == 1 else f"{stem} ({seen[stem]})")
+    return labels
+
+
+def merge_networks(networks, owners):
+    """Merge ``NetworkData`` objects, one per uploader named in ``owners``."""
+    tables = [network.connections[PERSON_COLUMNS] for network in networks]
+    rows = pd.concat(tables, ignore_index=True)
+    row_owner = np.repeat(np.arange(len(tables)), [len(table) for table in tables])
+
+    # One person per node ID, described by their first row
+    person_of_row, _ = pd.factorize(rows['node_id'])
+    _, first_rows = np.unique(person_of_row, return_index=True)
+    people = rows.iloc[first_rows].reset_index(drop=True)
+
+    membership = sp.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (row_owner, person_of_row)),
+        shape=(len(tables), len(people)))
+    # Node IDs are unique within an export (a profile listed twice gets two IDs, see
+    # ``connections.node_ids``), so each uploader-person pair occurs once; this only keeps entries 0/1
+    membership.sum_duplicates()
+    membership.data[:] = 1
+
+    people['owner_count'] = np.diff(membership.tocsc().indptr)
+    adjacency = sp.bmat([[None, membership], [membership.T, None]], format='csr')
+    return MergedNetwork(owners=list(owners), people=people, adjacency=adjacency, membership=membership)
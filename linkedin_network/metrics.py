@@ -0,0 +1,82 @@
+"""Graph metrics over a compact CSR adjacency matrix.
+
+Graphs are symmetric ``scipy.sparse.csr_matrix`` adjacencies without self
+loops: one ``int32`` index per edge end instead of NetworkX's per-node and
+per-edge dicts. Degrees are row lengths of the CSR index pointer, components
+come from ``scipy.sparse.csgraph`` and core numbers from vectorized peeling.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def adjacency_from_edges(n, sources, targets):
+    """Symmetric 0/1 CSR adjacency of ``n`` nodes from undirected edge arrays."""
+    rows = np.concatenate([sources, targets])
+    cols = np.concatenate([targets, sources])
+    adjacency = sp.csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+    adjacency.sum_duplicates()
+    adjacency.data[:] = 1
+    return adjacency
+
+
+def ego_adjacency(connection_count):
+    """Adjacency of an ego network: node 0 is the hub, nodes ``1..n`` its connections."""
+    leaves = np.arange(1, connection_count + 1)
+    return adjacency_from_edges(connection_count + 1, np.zeros(connection_count, dtype=np.int64), leaves)
+
+
+def induced_subgraph(adjacency, nodes):
+    """Adjacency among ``nodes``, renumbered in ``nodes`` order."""
+    return adjacency[nodes][:, nodes]
+
+
+def degrees(adjacency):
+    """Degree of every node."""
+    return np.diff(adjacency.indptr)
+
+
+def core_numbers(adjacency):
+    """Core number of every node: the largest k of a k-core containing it.
+
+    Peels every node of degree <= k at once and updates the remaining
+    degrees with one sparse product per round, raising k when nothing is
+    left to peel.
+    """
+    degree = degrees(adjacency).astype(np.int64)
+    core = np.zeros(len(degree), dtype=np.int64)
+    alive = np.ones(len(degree), dtype=bool)
+    k = 0
+    while alive.any():
+        k = max(k, degree[alive].min())
+        while True:
+            peel = alive & (degree <= k)
+            if not peel.any():
+                break
+            core[peel] = k
+            alive &= ~peel
+            degree -= adjacency @ peel.astype(np.int64)
+    return core
+
+
+def graph_metrics(adjacency):
+    """Summary metrics of a graph, JSON-serializable."""
+    # Loaded on the first metrics rather than with the app
+    from scipy.sparse.csgraph import connected_components
+
+    n = adjacency.shape[0]
+    degree = degrees(adjacency)
+    edges = int(degree.sum()) // 2
+    component_count, labels = connected_components(adjacency, directed=False) if n else (0, np.zeros(0, dtype=np.int64))
+    core = core_numbers(adjacency)
+    return {
+        "nodes": n,
+        "edges": edges,
+        "density": 2 * edges / (n * (n - 1)) if n > 1 else 0.0,
+        "average_degree": float(degree.mean()) if n else 0.0,
+        "max_degree": int(degree.max()) if n else 0,
+        "degree_distribution": {int(d): int(count) for d, count in enumerate(np.bincount(degree)) if count},
+        "components": int(component_count),
+        "largest_component": int(np.bincount(labels).max()) if n else 0,
+        "max_core": int(core.max()) if n else 0,
+    }
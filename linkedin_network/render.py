@@ -0,0 +1,287 @@
+"""Plotly figures for the network graph, built from NumPy arrays.
+
+Traces are assembled column-wise from the layout and the connection table
+instead of node by node. Views with more than ``WEBGL_NODE_THRESHOLD`` nodes
+are drawn with ``go.Scattergl`` so pan and zoom stay smooth in the browser.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import qualitative, sequential
+
+from .connections import HUB_ID
+from .ingest import MAIN_PERSON_DATA
+
+# Switch from SVG to WebGL traces above this many nodes
+WEBGL_NODE_THRESHOLD = 2000
+
+COMPANY_COLORS = qualitative.Plotly
+DATE_COLORS = sequential.Viridis
+# Merged networks: people coloured by how many uploaders share them
+SHARED_COLORS = sequential.Plasma
+MAIN_NODE_COLOR = '#0077b5'
+DEFAULT_NODE_COLOR = '#4a90e2'
+MAIN_NODE_SIZE = 40
+
+# Company overview: super-node sizes, member size, and how many companies get labels
+SUPER_NODE_MIN_SIZE = 12
+SUPER_NODE_MAX_SIZE = 50
+MEMBER_NODE_SIZE = 12
+OVERVIEW_LABELED_COMPANIES = 30
+
+# Kinds of points in the overview, reported back through customdata
+COMPANY_POINT = "company"
+PERSON_POINT = "person"
+
+
+def scatter_class(node_count, webgl_threshold=WEBGL_NODE_THRESHOLD):
+    """``go.Scattergl`` for large views, ``go.Scatter`` otherwise."""
+    return go.Scattergl if node_count > webgl_threshold else go.Scatter
+
+
+def edge_coordinates(xy, sources, targets):
+    """Line coordinates for edges, with NaN breaks between segments."""
+    gaps = np.full(len(sources), np.nan)
+    edge_x = np.column_stack([xy[sources, 0], xy[targets, 0], gaps]).ravel()
+    edge_y = np.column_stack([xy[sources, 1], xy[targets, 1], gaps]).ravel()
+    return edge_x, edge_y
+
+
+def node_colors(table, color_by):
+    """Colours for the connection rows of ``table`` and the company colour map.
+
+    The map is empty unless ``color_by`` is "Company".
+    """
+    colors = np.full(len(table), DEFAULT_NODE_COLOR, dtype=object)
+    company_color_map = {}
+
+    if color_by == "Company":
+        codes, companies = pd.factorize(table['company'])
+        palette = np.array(COMPANY_COLORS, dtype=object)
+        colors = palette[codes % len(palette)]
+        company_color_map = dict(zip(companies, palette[np.arange(len(companies)) % len(palette)]))
+    elif color_by == "Connection Date":
+        # Normalize parsed dates for the color scale; undated nodes keep the default color
+        epochs = table['connected_epoch'].to_numpy(dtype=np.float64)
+        dated = ~np.isnan(epochs)
+        if dated.any():
+            span = epochs[dated].max() - epochs[dated].min()
+            normalized = (epochs[dated] - epochs[dated].min()) / span if span > 0 else np.zeros(dated.sum())
+            palette = np.array(DATE_COLORS, dtype=object)
+            colors[dated] = palette[(normalized * (len(palette) - 1)).astype(np.int64)]
+
+    return colors, company_color_map
+
+
+def hover_labels(table):
+    """Hover text for the connection rows of ``table``."""
+    return ("<b>" + table['name'].astype(str) + "</b>"
+            + "<br>Title: " + table['title'].astype(str)
+            + "<br>Company: " + table['company'].astype(str)
+            + "<br>Connected: " + table['connected_on'].astype(str)).to_numpy(dtype=object)
+
+
+def _edge_trace(scatter, xy, sources, targets):
+    # Grey lines between the rows of ``xy`` at ``sources`` and ``targets``
+    edge_x, edge_y = edge_coordinates(xy, sources, targets)
+    return scatter(
+        x=edge_x, y=edge_y,
+        line=dict(width=1, color='rgba(125,125,125,0.3)'),
+        hoverinfo='none',
+        mode='lines'
+    )
+
+
+def _node_trace(scatter, xy, sizes, colors, hover_text, text, **extra):
+    # One marker per row of ``xy``; ``text`` is None when labels are hidden
+    return scatter(
+        x=xy[:, 0], y=xy[:, 1],
+        mode='markers' if text is None else 'markers+text',
+        hoverinfo='text',
+        hovertext=hover_text,
+        text=text,
+        textposition="top center",
+        textfont=dict(color='#0077b5', size=12),
+        marker=dict(
+            size=sizes,
+            color=colors,
+            line=dict(width=2, color='white')
+        ),
+        **extra
+    )
+
+
+def _graph_layout(title, equal_axes=False, **extra):
+    # Layout shared by the graph views: no axes or legend, pan by dragging
+    yaxis = dict(showgrid=False, zeroline=False, showticklabels=False)
+    if equal_axes:
+        yaxis['scaleanchor'] = 'x'
+    return go.Layout(
+        title=dict(
+            text=title,
+            font=dict(size=16, color='#0077b5')
+        ),
+        showlegend=False,
+        hovermode='closest',
+        margin=dict(b=40, l=20, r=20, t=60),
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=yaxis,
+        plot_bgcolor='white',
+        dragmode='pan',
+        **extra
+    )
+
+
+def build_network_figure(positions, table, title, show_labels=True, show_edges=True,
+                         color_by="Type", node_size=20, hub=HUB_ID,
+                         webgl_threshold=WEBGL_NODE_THRESHOLD):
+    """Figure of ``hub`` and the connections in ``table``.
+
+    ``positions`` are the ``NodePositions`` of the hub and ``table['node_id']``.
+    Returns ``(figure, company_color_map)``.
+    """
+    nodes = np.concatenate([[hub], table['node_id'].to_numpy(dtype=np.int64)])
+    hub_name = MAIN_PERSON_DATA['name']
+    xy = positions.take(nodes)
+    scatter = scatter_class(len(nodes), webgl_threshold)
+
+    fig_data = []
+
+    # Every connection links back to the hub
+    if show_edges and len(table):
+        fig_data.append(_edge_trace(scatter, xy, np.zeros(len(table), dtype=np.int64), np.arange(1, len(nodes))))
+
+    colors, company_color_map = node_colors(table, color_by)
+    colors = np.concatenate([[MAIN_NODE_COLOR], colors])
+    sizes = np.concatenate([[MAIN_NODE_SIZE], np.full(len(table), node_size)])
+
+    hub_hover = "<br>".join([
+        f"<b>{hub_name}</b>",
+        f"Title: {MAIN_PERSON_DATA['title']}",
+        f"Company: {MAIN_PERSON_DATA['company']}",
+        f"Connected: {MAIN_PERSON_DATA['connected_on']}"
+    ])
+    hover_text = np.concatenate([[hub_hover], hover_labels(table)])
+
+    # Show first names for connections if labels are enabled
+    text = None
+    if show_labels:
+        first_names = table['name'].astype(str).str.split(n=1).str[0].fillna("")
+        text = np.concatenate([[hub_name], first_names.to_numpy(dtype=object)])
+
+    fig_data.append(_node_trace(scatter, xy, sizes, colors, hover_text, text))
+    fig = go.Figure(data=fig_data, layout=_graph_layout(title))
+    return fig, company_color_map
+
+
+def build_overview_figure(company_counts, super_xy, expanded, title, show_labels=True, show_edges=True,
+                          webgl_threshold=WEBGL_NODE_THRESHOLD):
+    """Figure with one super-node per company around "You".
+
+    ``company_counts`` is ordered like ``super_xy``; ``expanded`` maps
+    positions of expanded companies to ``(member_rows, members_xy)``.
+    Each point's customdata is ``[kind, value]`` with kind ``COMPANY_POINT``
+    (value: company) or ``PERSON_POINT`` (value: node ID).
+    """
+    hub_name = MAIN_PERSON_DATA['name']
+    companies = company_counts.index.astype(str).to_numpy(dtype=object)
+    counts = company_counts.to_numpy()
+    palette = np.array(COMPANY_COLORS, dtype=object)
+    company_colors = palette[np.arange(len(companies)) % len(palette)]
+
+    member_tables = [rows for rows, _ in expanded.values()]
+    member_xy = [xy for _, xy in expanded.values()]
+    member_colors = [np.full(len(rows), company_colors[position], dtype=object)
+                     for position, (rows, _) in expanded.items()]
+    member_count = sum(len(rows) for rows in member_tables)
+    scatter = scatter_class(1 + len(companies) + member_count, webgl_threshold)
+
+    xy = np.vstack([np.zeros((1, 2)), super_xy.reshape(-1, 2), *member_xy])
+    fig_data = []
+
+    if show_edges and len(xy) > 1:
+        # The hub links to every company, each expanded company to its members
+        sources = np.concatenate([np.zeros(len(companies), dtype=np.int64)] + [
+            np.full(len(rows), 1 + position, dtype=np.int64) for position, rows in zip(expanded, member_tables)
+        ])
+        fig_data.append(_edge_trace(scatter, xy, sources, np.arange(1, len(xy))))
+
+    largest = counts.max() if len(counts) else 1
+    super_sizes = SUPER_NODE_MIN_SIZE + (SUPER_NODE_MAX_SIZE - SUPER_NODE_MIN_SIZE) * np.sqrt(counts / largest)
+    super_hover = ("<b>" + pd.Series(companies, dtype=object) + "</b><br>"
+                   + pd.Series(counts, dtype=object).map(str) + " connections<br>Click to expand or collapse")
+    members = pd.concat(member_tables) if member_tables else pd.DataFrame(columns=['node_id', 'name', 'title', 'company', 'connected_on'])
+
+    sizes = np.concatenate([[MAIN_NODE_SIZE], super_sizes, np.full(member_count, MEMBER_NODE_SIZE)])
+    colors = np.concatenate([[MAIN_NODE_COLOR], company_colors, *member_colors])
+    hover_text = np.concatenate([[f"<b>{hub_name}</b>"], super_hover.to_numpy(dtype=object), hover_labels(members)])
+    customdata = np.column_stack([
+        np.concatenate([[""], np.full(len(companies), COMPANY_POINT, dtype=object),
+                        np.full(member_count, PERSON_POINT, dtype=object)]),
+        np.concatenate([[""], companies, members['node_id'].to_numpy(dtype=object)]),
+    ])
+
+    text = None
+    if show_labels:
+        labels = np.where(np.arange(len(companies)) < OVERVIEW_LABELED_COMPANIES, companies, "")
+        labels[list(expanded)] = companies[list(expanded)]
+        text = np.concatenate([[hub_name], labels, np.full(member_count, "", dtype=object)])
+
+    fig_data.append(_node_trace(scatter, xy, sizes, colors, hover_text, text, customdata=customdata))
+    fig = go.Figure(data=fig_data, layout=_graph_layout(title, equal_axes=True, clickmode='event+select'))
+    return fig
+
+
+def build_merged_figure(xy, sources, targets, owners, people, title, show_labels=True, show_edges=True,
+                        webgl_threshold=WEBGL_NODE_THRESHOLD):
+    """Figure of a merged network: one hub per uploader and the people in ``people``.
+
+    Rows of ``xy`` are the hubs (in ``owners`` order) followed by the rows of
+    ``people``, which has an ``owner_count`` column; ``sources``/``targets``
+    index into them.
+    """
+    hub_count = len(owners)
+    scatter = scatter_class(hub_count + len(people), webgl_threshold)
+    fig_data = []
+
+    if show_edges and len(sources):
+        fig_data.append(_edge_trace(scatter, xy, sources, targets))
+
+    owner_counts = people['owner_count'].to_numpy()
+    hub_degrees = np.bincount(sources[sources < hub_count], minlength=hub_count) \
+        + np.bincount(targets[targets < hub_count], minlength=hub_count)
+    hub_palette = np.array(COMPANY_COLORS, dtype=object)
+    shared_palette = np.array(SHARED_COLORS, dtype=object)
+
+    colors = np.concatenate([hub_palette[np.arange(hub_count) % len(hub_palette)],
+                             shared_palette[np.minimum(owner_counts - 1, len(shared_palette) - 1)]])
+    sizes = np.concatenate([np.full(hub_count, MAIN_NODE_SIZE), MEMBER_NODE_SIZE * np.sqrt(owner_counts)])
+    hub_hover = [f"<b>{owner}</b><br>{degree} connections shown" for owner, degree in zip(owners, hub_degrees)]
+    people_hover = ("<b>" + people['name'].astype(str) + "</b>"
+                    + "<br>Title: " + people['title'].astype(str)
+                    + "<br>Company: " + people['company'].astype(str)
+                    + "<br>In " + people['owner_count'].astype(str) + " networks").to_numpy(dtype=object)
+    hover_text = np.concatenate([np.array(hub_hover, dtype=object), people_hover])
+
+    text = None
+    if show_labels:
+        text = np.concatenate([np.array(owners, dtype=object), np.full(len(people), "", dtype=object)])
+
+    fig_data.append(_node_trace(scatter, xy, sizes, colors, hover_text, text))
+    fig = go.Figure(data=fig_data, layout=_graph_layout(title))
+    return fig
+
+
+def build_bar_figure(counts, title, xaxis_title, yaxis_title, height=400):
+    """Bar chart of a Series of counts, labelled by its index."""
+    fig = go.Figure(data=[go.Bar(x=counts.index.astype(str), y=counts.to_numpy(), marker_color=MAIN_NODE_COLOR)])
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title, height=height)
+    return fig
+
+
+def build_pie_figure(counts, title, height=400):
+    """Donut chart of a Series of counts, labelled by its index."""
+    fig = go.Figure(data=[go.Pie(labels=counts.index.astype(str), values=counts.to_numpy(), hole=.3)])
+    fig.update_layout(title=title, height=height)
+    return fig
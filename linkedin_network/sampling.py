@@ -0,0 +1,128 @@
+"""Deterministic sampling of connections for the visualization modes.
+
+Every connection gets a pseudo-random key by hashing its node ID salted
+with the sample seed. A sample of ``k`` rows is the ``k`` candidates with the
+smallest keys, so the same table, filters, size and seed always give the
+same rows. The sample also grows by adding rows when ``k`` increases, which
+keeps cached and warm-started layouts useful. Stratified samples work on
+the company and title codes of the categorical columns instead of
+comparing strings.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .connections import UNKNOWN_COMPANY
+
+SAMPLE_SEED = 0
+# Spreads consecutive seeds over the 64-bit salt space (the golden ratio in fixed point)
+SEED_MULTIPLIER = 0x9E3779B97F4A7C15
+# Key orders kept per table; each holds one row position per connection
+KEY_ORDER_CACHE_ENTRIES = 4
+
+# "Company Clusters": companies shown and the minimum per company
+CLUSTER_COMPANIES = 10
+MIN_PER_COMPANY = 5
+
+# "Most Connected": connections with the most common titles come first
+COMMON_TITLES = 20
+
+
+def _group_heads(rows, groups, per_group):
+    # First ``per_group`` of ``rows`` in each run of equal ``groups``
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]]) if len(rows) else np.zeros(0, dtype=np.int64)
+    run_lengths = np.diff(np.r_[starts, len(rows)])
+    rank_in_group = np.arange(len(rows)) - np.repeat(starts, run_lengths)
+    return rows[rank_in_group < per_group]
+
+
+class Sampler:
+    """Seeded and stratified row samples of one connection table.
+
+    Methods take a boolean row ``mask`` (``None`` for every row) and return
+    row positions into the table.
+    """
+
+    def __init__(self, table):
+        self.size = len(table)
+        self._node_ids = table['node_id'].to_numpy(dtype=np.int64)
+        self.company_codes = table['company'].cat.codes.to_numpy()
+        self.title_codes = table['title'].cat.codes.to_numpy()
+        self.company_count = len(table['company'].cat.categories)
+        self.title_count = len(table['title'].cat.categories)
+        companies = table['company'].cat.categories
+        self.unknown_company = companies.get_loc(UNKNOWN_COMPANY) if UNKNOWN_COMPANY in companies else -1
+
+        self._key_orders = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key_order(self, seed=SAMPLE_SEED):
+        """All rows, ordered by their sampling key for ``seed``."""
+        with self._lock:
+            order = self._key_orders.get(seed)
+            if order is not None:
+                self._key_orders.move_to_end(seed)
+        if order is None:
+            salt = (seed * SEED_MULTIPLIER) & np.iinfo(np.int64).max
+            keys = pd.util.hash_array(self._node_ids ^ np.int64(salt))
+            order = np.argsort(keys, kind='stable')
+            with self._lock:
+                # Every "Reshuffle sample" click brings a new seed; keep the most recent few
+                self._key_orders[seed] = order
+                while len(self._key_orders) > KEY_ORDER_CACHE_ENTRIES:
+                    self._key_orders.popitem(last=False)
+        return order
+
+    def _candidates(self, mask, seed):
+        # Rows passing ``mask``, in key order
+        order = self.key_order(seed)
+        return order if mask is None else order[mask[order]]
+
+    def sample(self, mask, k, seed=SAMPLE_SEED):
+        """Up to ``k`` rows, in row order."""
+        return np.sort(self._candidates(mask, seed)[:k])
+
+    def company_clusters(self, mask, k, seed=SAMPLE_SEED, companies=CLUSTER_COMPANIES):
+        """Rows from the largest known companies, topped up with other rows.
+
+        Each of the ``companies`` largest companies among the ``mask`` rows
+        contributes up to ``max(k // companies, MIN_PER_COMPANY)`` rows, in
+        company order; the remaining slots up to ``k`` go to rows outside
+        those companies.
+        """
+        candidates = self._candidates(mask, seed)
+        counts = np.bincount(self.company_codes[candidates], minlength=self.company_count)
+        if self.unknown_company >= 0:
+            counts[self.unknown_company] = 0
+        top = np.argsort(-counts, kind='stable')[:companies]
+        top = top[counts[top] > 0]
+
+        # Rank of each company among the top ones; everything else ranks last
+        rank = np.full(self.company_count, len(top))
+        rank[top] = np.arange(len(top))
+        candidate_rank = rank[self.company_codes[candidates]]
+        in_top = candidate_rank < len(top)
+
+        # Stable sort by company rank keeps key order within each company
+        clustered = candidates[in_top][np.argsort(candidate_rank[in_top], kind='stable')]
+        per_company = max(k // companies, MIN_PER_COMPANY)
+        clustered = _group_heads(clustered, self.company_codes[clustered], per_company)
+
+        remaining = max(k - len(clustered), 0)
+        return np.concatenate([clustered, np.sort(candidates[~in_top][:remaining])])
+
+    def most_connected(self, mask, k, seed=SAMPLE_SEED, titles=COMMON_TITLES):
+        """Up to ``k`` rows, those holding the ``titles`` most common titles first."""
+        candidates = self._candidates(mask, seed)
+        counts = np.bincount(self.title_codes[candidates], minlength=self.title_count)
+        top = np.argsort(-counts, kind='stable')[:titles]
+        is_common = np.zeros(self.title_count, dtype=bool)
+        is_common[top[counts[top] > 0]] = True
+
+        has_common_title = is_common[self.title_codes[candidates]]
+        priority = candidates[has_common_title][:k]
+        rest = candidates[~has_common_title][:k - len(priority)]
+        return np.sort(np.concatenate([priority, rest]))
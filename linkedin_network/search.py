@@ -0,0 +1,176 @@
+"""Ranked search over connection names, companies and positions.
+
+The index is built once per upload. Text is normalized (case-folded, accents
+stripped) and split into word tokens. For each field, the sorted token
+vocabulary acts as a flattened prefix trie: every token that starts with a
+prefix sits in one contiguous slice of it. Postings are stored CSR-style in
+vocabulary order, so the rows for a whole prefix range are a single array
+slice. A trigram index over the vocabulary answers substring queries.
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Fields searched, with how much a match in each counts towards the rank
+SEARCH_FIELDS = [('name', 3.0), ('company', 2.0), ('title', 1.0)]
+
+# Match quality multipliers
+EXACT_MATCH = 3.0
+PREFIX_MATCH = 2.0
+SUBSTRING_MATCH = 1.0
+
+# Match rows through postings when they are fewer than size / SPARSE_MATCH_RATIO
+SPARSE_MATCH_RATIO = 8
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def normalize_text(text):
+    """Case-fold ``text`` and strip accents."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def tokenize(text):
+    """Normalized word tokens of ``text``."""
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+def _tokenize_series(series):
+    # Tokenize each distinct value once; companies and titles repeat a lot
+    values = series.astype(str)
+    uniques = pd.unique(values)
+    return values.map(dict(zip(uniques, map(tokenize, uniques))))
+
+
+def _trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class _FieldIndex:
+    """Token vocabulary, CSR postings and trigrams for one column.
+
+    Postings point at distinct column values rather than rows, so a token
+    shared by thousands of rows (a company name, a common title) costs one
+    entry; ``codes`` maps each row to its value.
+    """
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(values.astype(str))
+        self.codes = codes.astype(np.int32)
+        self.value_count = len(uniques)
+
+        # Rows of each value, CSR-style, for matches that cover few rows
+        self.value_rows = np.argsort(codes, kind='stable')
+        self.value_indptr = np.searchsorted(codes[self.value_rows], np.arange(len(uniques) + 1))
+        self.value_sizes = np.diff(self.value_indptr)
+
+        tokens = _tokenize_series(pd.Series(uniques)).explode().dropna()
+        pairs = pd.DataFrame({'token': tokens.to_numpy(dtype=object), 'value': tokens.index.to_numpy()})
+        pairs = pairs.drop_duplicates()
+
+        token_codes, vocab = pd.factorize(pairs['token'], sort=True)
+        order = np.argsort(token_codes, kind='stable')
+        self.vocab = np.asarray(vocab, dtype=object)
+        self.values = pairs['value'].to_numpy(dtype=np.int64)[order]
+        self.indptr = np.searchsorted(token_codes[order], np.arange(len(self.vocab) + 1))
+
+        trigrams = {}
+        for token_id, token in enumerate(self.vocab):
+            for trigram in _trigrams(token):
+                trigrams.setdefault(trigram, []).append(token_id)
+        self.trigrams = {trigram: np.array(ids, dtype=np.int64) for trigram, ids in trigrams.items()}
+
+    def _token_range(self, prefix):
+        lo = np.searchsorted(self.vocab, prefix, side='left')
+        hi = np.searchsorted(self.vocab, prefix + '\U0010ffff', side='left')
+        return lo, hi
+
+    def exact_values(self, term):
+        lo, hi = self._token_range(term)
+        if lo < len(self.vocab) and self.vocab[lo] == term:
+            return self.values[self.indptr[lo]:self.indptr[lo + 1]]
+        return self.values[:0]
+
+    def prefix_values(self, term):
+        lo, hi = self._token_range(term)
+        return self.values[self.indptr[lo]:self.indptr[hi]]
+
+    def substring_values(self, term):
+        if len(term) < 3:
+            return self.values[:0]
+        candidates = None
+        for trigram in _trigrams(term):
+            ids = self.trigrams.get(trigram)
+            if ids is None:
+                return self.values[:0]
+            candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+        token_ids = [token_id for token_id in candidates if term in self.vocab[token_id]]
+        if not token_ids:
+            return self.values[:0]
+        return np.concatenate([self.values[self.indptr[i]:self.indptr[i + 1]] for i in token_ids])
+
+
+class SearchIndex:
+    """Search index over the name, company and title of every connection."""
+
+    def __init__(self, table):
+        self.size = len(table)
+        self.fields = [(_FieldIndex(table[field].reset_index(drop=True)), weight) for field, weight in SEARCH_FIELDS]
+
+    def _term_scores(self, term):
+        scores = np.zeros(self.size, dtype=np.float32)
+        for field, weight in self.fields:
+            value_scores = np.zeros(field.value_count, dtype=np.float32)
+            for values, quality in ((field.substring_values(term), SUBSTRING_MATCH),
+                                    (field.prefix_values(term), PREFIX_MATCH),
+                                    (field.exact_values(term), EXACT_MATCH)):
+                value_scores[values] = weight * quality
+
+            matched = np.flatnonzero(value_scores)
+            if not len(matched):
+                continue
+            if field.value_sizes[matched].sum() * SPARSE_MATCH_RATIO < self.size:
+                # Few rows match: scatter them through the value -> rows postings
+                sizes = field.value_sizes[matched]
+                offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+                rows = field.value_rows[np.repeat(field.value_indptr[matched], sizes) + offsets]
+                row_scores = np.repeat(value_scores[matched], sizes)
+                scores[rows] = np.maximum(scores[rows], row_scores)
+            else:
+                np.maximum(scores, value_scores[field.codes], out=scores)
+        return scores
+
+    def search(self, query, k=10):
+        """Return ``(rows, total)``: the top ``k`` matching row positions and the match count.
+
+        Every word of the query must match a name, company or title token
+        exactly, as a prefix or as a substring. Rows are ranked by match
+        quality and field, ties broken by row order.
+        """
+        terms = tokenize(query)
+        if not terms or not self.size:
+            return np.zeros(0, dtype=np.int64), 0
+
+        total = self._term_scores(terms[0])
+        for term in terms[1:]:
+            # Every term must match: rows missed by any term drop to zero
+            scores = self._term_scores(term)
+            total = np.where((total > 0) & (scores > 0), total + scores, 0)
+
+        # Scores take few distinct values: collect rows level by level, best first
+        count = int(np.count_nonzero(total))
+        top = []
+        remaining = min(k, count)
+        level = total.max() if count else 0
+        while remaining > 0:
+            rows = np.flatnonzero(total == level)[:remaining]
+            top.append(rows)
+            remaining -= len(rows)
+            if remaining > 0:
+                level = total[total < level].max()
+        rows = np.concatenate(top) if top else np.zeros(0, dtype=np.int64)
+        return rows, count
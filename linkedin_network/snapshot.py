@@ -0,0 +1,171 @@
+"""Processed networks saved to disk and reopened without parsing the CSV.
+
+A snapshot is a directory named after the upload's content digest:
+
+``manifest.json``     format version, name, size and the saved layout keys
+``connections.arrow`` the connection table, with parsed dates and industries
+``raw.arrow``         the raw export as read from the CSV
+``layouts.arrow``     cached layout positions, one row per node and layout
+
+Tables are uncompressed Arrow IPC files, so reopening memory-maps them
+instead of parsing the CSV again. On pandas 3, whose strings are
+Arrow-backed, the string columns are handed over without decoding them; on
+pandas 2 they are converted to Python strings on load, which makes
+reopening a few times slower. Only the cheap indexes of ``NetworkData`` are
+rebuilt on load.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+from .connections import HUB_ID
+from .ingest import build_network
+from .instrumentation import NULL_RECORDER
+from .layout import NodePositions
+
+# Bumped whenever the files or the connection table columns change
+SNAPSHOT_VERSION = 1
+
+DEFAULT_SNAPSHOT_DIR = "snapshots"
+MANIFEST_FILE = "manifest.json"
+CONNECTIONS_FILE = "connections.arrow"
+RAW_FILE = "raw.arrow"
+LAYOUTS_FILE = "layouts.arrow"
+
+# Categorical columns whose categories are "string" dtype; Arrow brings them back as "str"
+STRING_CATEGORY_COLUMNS = ['title', 'company']
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot is missing or was written by another format version."""
+
+
+def snapshot_path(digest, directory=DEFAULT_SNAPSHOT_DIR):
+    return Path(directory) / digest
+
+
+def _write_arrow(table, path):
+    # Write next to the target and swap it in, so readers never see half a file
+    temporary = path.with_name(path.name + ".tmp")
+    with pa.OSFile(str(temporary), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(temporary, path)
+
+
+def _read_arrow(path):
+    # Column buffers point into the mapped file; pages are read on first access
+    return pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+
+
+def _layout_entries(layout_cache, node_ids):
+    # Cached layouts drawn entirely from this network's nodes
+    known = np.concatenate([[HUB_ID], node_ids.to_numpy(dtype=np.int64)])
+    for (nodes, algorithm, spacing), positions in layout_cache.items():
+        if positions.index.isin(known).all():
+            name, data = algorithm if isinstance(algorithm, tuple) else (algorithm, None)
+            yield {"nodes": nodes, "algorithm": name, "data": data, "spacing": spacing}, positions
+
+
+def save_snapshot(network, name, directory=DEFAULT_SNAPSHOT_DIR, layout_cache=None):
+    """Save ``network`` under its digest, with the layouts in ``layout_cache`` that fit it.
+
+    Returns the manifest. Saving the same network again replaces the snapshot.
+    """
+    path = snapshot_path(network.digest, directory)
+    path.mkdir(parents=True, exist_ok=True)
+
+    layouts, columns = [], {"entry": [], "node_id": [], "x": [], "y": []}
+    if layout_cache is not None:
+        for entry, (key, positions) in enumerate(_layout_entries(layout_cache, network.connections['node_id'])):
+            layouts.append(key)
+            columns["entry"].append(np.full(len(positions), entry, dtype=np.int32))
+            columns["node_id"].append(positions.nodes.astype(np.int64))
+            columns["x"].append(positions.xy[:, 0])
+            columns["y"].append(positions.xy[:, 1])
+    dtypes = {"entry": np.int32, "node_id": np.int64, "x": np.float64, "y": np.float64}
+    layout_table = pa.table({column: np.concatenate(parts) if parts else np.zeros(0, dtype=dtypes[column])
+                             for column, parts in columns.items()})
+
+    _write_arrow(pa.Table.from_pandas(network.connections, preserve_index=False), path / CONNECTIONS_FILE)
+    _write_arrow(pa.Table.from_pandas(network.df, preserve_index=False), path / RAW_FILE)
+    _write_arrow(layout_table, path / LAYOUTS_FILE)
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "digest": network.digest,
+        "name": name,
+        "connections": len(network.connections),
+        "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "layouts": layouts,
+    }
+    # The manifest goes last: a snapshot without one is ignored
+    temporary = path / (MANIFEST_FILE + ".tmp")
+    temporary.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    os.replace(temporary, path / MANIFEST_FILE)
+    return manifest
+
+
+def read_manifest(digest, directory=DEFAULT_SNAPSHOT_DIR):
+    """The manifest of a snapshot; raises ``SnapshotError`` if it is missing or outdated."""
+    path = snapshot_path(digest, directory) / MANIFEST_FILE
+    try:
+        manifest = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"No saved network {digest[:12]}: {e}") from e
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Saved network {manifest.get('name', digest[:12])} has format version "
+                            f"{manifest.get('version')}, expected {SNAPSHOT_VERSION}; upload it again")
+    return manifest
+
+
+def has_snapshot(digest, directory=DEFAULT_SNAPSHOT_DIR):
+    try:
+        read_manifest(digest, directory)
+    except SnapshotError:
+        return False
+    return True
+
+
+def list_snapshots(directory=DEFAULT_SNAPSHOT_DIR):
+    """Manifests of the readable snapshots in ``directory``, most recently saved first."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    manifests = []
+    for path in directory.iterdir():
+        if path.is_dir():
+            try:
+                manifests.append(read_manifest(path.name, directory))
+            except SnapshotError:
+                continue
+    return sorted(manifests, key=lambda manifest: manifest["saved_at"], reverse=True)
+
+
+def load_snapshot(digest, directory=DEFAULT_SNAPSHOT_DIR, layout_cache=None, recorder=NULL_RECORDER):
+    """Reopen a saved network as ``NetworkData``; its layouts are put into ``layout_cache``."""
+    manifest = read_manifest(digest, directory)
+    path = snapshot_path(digest, directory)
+    with recorder.stage("map snapshot", rows=manifest["connections"]):
+        connections = _read_arrow(path / CONNECTIONS_FILE).to_pandas(split_blocks=True)
+        for column in STRING_CATEGORY_COLUMNS:
+            categories = connections[column].cat.categories
+            connections[column] = connections[column].cat.rename_categories(categories.astype('string'))
+        df = _read_arrow(path / RAW_FILE).to_pandas(split_blocks=True)
+
+    if layout_cache is not None and manifest["layouts"]:
+        layouts = _read_arrow(path / LAYOUTS_FILE)
+        entries = layouts.column("entry").to_numpy()
+        node_ids = layouts.column("node_id").to_numpy()
+        xy = np.column_stack([layouts.column("x").to_numpy(), layouts.column("y").to_numpy()])
+        bounds = np.searchsorted(entries, np.arange(len(manifest["layouts"]) + 1))
+        for entry, key in enumerate(manifest["layouts"]):
+            rows = slice(bounds[entry], bounds[entry + 1])
+            algorithm = key["algorithm"] if key["data"] is None else (key["algorithm"], key["data"])
+            layout_cache.put((key["nodes"], algorithm, key["spacing"]),
+                             NodePositions(node_ids[rows], xy[rows]))
+    return build_network(digest, df, connections, recorder)
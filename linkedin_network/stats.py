@@ -0,0 +1,30 @@
+"""Summary statistics of a network, shared by the app and the batch mode."""
+
+from datetime import datetime
+
+from .connections import industry_counts, known_company_counts, with_dates
+from .metrics import graph_metrics
+
+# Companies listed in the statistics, most connected first
+TOP_COMPANIES = 5
+
+
+def network_statistics(network, top_companies=TOP_COMPANIES):
+    """JSON-serializable statistics of a ``NetworkData``."""
+    connections = network.connections
+    company_counts = known_company_counts(connections)
+    dates = with_dates(connections)['connected_at']
+    yearly = network.company_timelines["Year"]
+    return {
+        "total_connections": len(connections),
+        "unique_companies": len(company_counts),
+        "with_email": int((connections['email'] != "").sum()),
+        "with_url": int((connections['url'] != "").sum()),
+        "top_companies": {str(company): int(count) for company, count in company_counts.head(top_companies).items()},
+        "industries": {str(industry): int(count) for industry, count in industry_counts(connections).items()},
+        "first_connected": dates.min().date().isoformat() if len(dates) else None,
+        "last_connected": dates.max().date().isoformat() if len(dates) else None,
+        "new_companies_by_year": {str(year): int(count) for year, count in yearly.items()},
+        "graph": graph_metrics(network.adjacency),
+        "generation_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
@@ -0,0 +1,152 @@
+"""Synthetic LinkedIn Connections.csv exports for benchmarks.
+
+Usage::
+
+    python -m linkedin_network.synthetic 100000 -o Connections_100k.csv --encoding latin-1
+
+The exports look like LinkedIn's: the "Notes:" preamble, the seven expected
+columns, companies and positions drawn from Zipf distributions so a few
+employers dominate, first and last names from small pools so names repeat,
+mostly missing email addresses, "%d %b %Y" dates with some blank or
+malformed, quoted values with commas and accented names. The same seed
+always gives the same bytes.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .ingest import EXPECTED_COLUMNS
+
+# Notes LinkedIn writes above the header row
+NOTES_PREAMBLE = (
+    'Notes:\n'
+    '"When exporting your connection data, you may notice that some of the email addresses are missing. '
+    'You will only see email addresses for connections who have allowed their connections to see or download '
+    'their email address using this setting https://www.linkedin.com/psettings/privacy/email. '
+    'You can learn more here https://www.linkedin.com/help/linkedin/answer/261"\n'
+    '\n'
+)
+
+# Encodings exports arrive in; "utf-8-sig" and "utf-16" start with a byte order mark
+ENCODINGS = ["utf-8", "utf-8-sig", "utf-16", "latin-1"]
+
+FIRST_NAMES = ['James', 'Mary', 'Michael', 'Sarah', 'David', 'Priya', 'Wei', 'Maria', 'José', 'Zoë', 'Ahmed',
+               'Olga', 'Kenji', 'Fatima', 'Liam', 'Emma', 'Noah', 'Sofía', 'Lucas', 'Chloé', 'Raj', 'Anna',
+               'Daniel', 'Laura', 'Omar', 'Ingrid', 'Mateo', 'Yuki', 'Hannah', 'Ethan']
+LAST_NAMES = ['Smith', 'Chen', 'García', 'Patel', 'Müller', 'Kim', 'Nguyen', 'Johnson', 'Silva', 'Kowalski',
+              'Rossi', 'Haddad', "O'Brien", 'Dubois', 'Tanaka', 'Ivanova', 'Brown', 'Jensen', 'Lopez', 'Singh',
+              'Wilson', 'Björk', 'Khan', 'Martin', 'Novak', 'Sato', 'Fischer', 'Costa', 'Reyes', 'Taylor']
+
+COMPANY_PREFIXES = ['Acme', 'Blue Harbor', 'Northwind', 'Summit', 'Crescent', 'Redwood', 'Atlas', 'Vertex',
+                    'Pioneer', 'Silverline', 'Evergreen', 'Orion', 'Granite', 'Beacon', 'Nimbus', 'Keystone',
+                    'Lakeside', 'Meridian', 'Polaris', 'Riverstone']
+COMPANY_SUFFIXES = ['Technologies', 'Software', 'Bank', 'Capital', 'Health', 'Medical', 'Consulting', 'Advisory',
+                    'University', 'School District', 'Labs', 'Data', 'Cloud', 'Pharma', 'Retail', 'Logistics',
+                    'Media', 'Energy', 'Group', 'Partners, LLC', 'Holdings, Inc.', 'Foods', 'Motors', 'Studios']
+TITLE_LEVELS = ['', 'Senior ', 'Lead ', 'Principal ', 'Junior ', 'Head of ', 'VP, ']
+TITLE_ROLES = ['Software Engineer', 'Data Scientist', 'Product Manager', 'Analyst', 'Consultant', 'Recruiter',
+               'Account Executive', 'Designer', 'Nurse', 'Professor', 'Teacher', 'Marketing Manager',
+               'Operations Manager', 'Financial Analyst', 'Research Scientist', 'Founder', 'Sales, EMEA',
+               'Customer Success Manager', 'Clinical Research Associate', 'Developer Advocate']
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Zipf exponents: a handful of companies and roles account for most rows
+COMPANY_ZIPF = 1.1
+TITLE_ZIPF = 1.2
+
+# Share of rows with each kind of gap or oddity
+EMAIL_RATE = 0.15
+MISSING_URL_RATE = 0.01
+MISSING_COMPANY_RATE = 0.05
+MISSING_POSITION_RATE = 0.03
+MISSING_DATE_RATE = 0.01
+MALFORMED_DATE_RATE = 0.005
+DUPLICATE_RATE = 0.002
+
+FIRST_YEAR = 2005
+LAST_YEAR = 2025
+
+
+def _zipf_choice(rng, pool, exponent, size):
+    # Zipf ranks folded into the pool, so rank 1 is the most common value
+    ranks = rng.zipf(exponent, size) - 1
+    return np.asarray(pool, dtype=object)[ranks % len(pool)]
+
+
+def _slug(series):
+    return series.str.lower().str.replace(r'[^a-z0-9]+', '-', regex=True).str.strip('-')
+
+
+def synthetic_connections(rows, seed=0):
+    """A raw export of ``rows`` connections as a DataFrame of ``EXPECTED_COLUMNS`` text."""
+    rng = np.random.default_rng(seed)
+    # Shuffled so the most common companies and titles span industries
+    companies = rng.permutation([f"{prefix} {suffix}" for suffix in COMPANY_SUFFIXES for prefix in COMPANY_PREFIXES])
+    titles = rng.permutation([f"{level}{role}" for level in TITLE_LEVELS for role in TITLE_ROLES])
+
+    first = pd.Series(rng.choice(FIRST_NAMES, rows))
+    last = pd.Series(rng.choice(LAST_NAMES, rows))
+    company = pd.Series(_zipf_choice(rng, companies, COMPANY_ZIPF, rows))
+    position = pd.Series(_zipf_choice(rng, titles, TITLE_ZIPF, rows))
+
+    ids = pd.Series(rng.integers(0, 16 ** 8, rows)).map('{:08x}'.format)
+    url = "https://www.linkedin.com/in/" + _slug(first + " " + last) + "-" + ids
+    email = _slug(first) + "." + _slug(last) + "@" + _slug(company) + ".com"
+
+    day = rng.integers(1, 29, rows)
+    month = rng.integers(0, 12, rows)
+    year = rng.integers(FIRST_YEAR, LAST_YEAR + 1, rows)
+    connected_on = (pd.Series(day).map('{:02d}'.format) + " " + pd.Series(np.asarray(MONTHS)[month]) + " "
+                    + pd.Series(year).astype(str))
+
+    df = pd.DataFrame({
+        'First Name': first,
+        'Last Name': last,
+        'URL': url.where(rng.random(rows) >= MISSING_URL_RATE, ""),
+        'Email Address': email.where(rng.random(rows) < EMAIL_RATE, ""),
+        'Company': company.where(rng.random(rows) >= MISSING_COMPANY_RATE, ""),
+        'Position': position.where(rng.random(rows) >= MISSING_POSITION_RATE, ""),
+        'Connected On': connected_on,
+    }, columns=EXPECTED_COLUMNS)
+
+    odd = rng.random(rows)
+    df.loc[odd < MISSING_DATE_RATE, 'Connected On'] = ""
+    df.loc[(odd >= MISSING_DATE_RATE) & (odd < MISSING_DATE_RATE + MALFORMED_DATE_RATE), 'Connected On'] = "2019-13-45"
+
+    # The same profile listed twice, as in real exports
+    duplicates = np.flatnonzero(rng.random(rows) < DUPLICATE_RATE)
+    sources = rng.integers(0, rows, len(duplicates))
+    df.iloc[duplicates] = df.iloc[sources].to_numpy()
+    return df
+
+
+def synthetic_export(rows, seed=0, encoding="utf-8"):
+    """The bytes of a synthetic Connections.csv with ``rows`` connections."""
+    text = NOTES_PREAMBLE + synthetic_connections(rows, seed).to_csv(index=False, lineterminator='\n')
+    return text.encode(encoding, errors='replace')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m linkedin_network.synthetic",
+        description="Write a synthetic LinkedIn Connections.csv export.")
+    parser.add_argument("rows", type=int, help="number of connections")
+    parser.add_argument("-o", "--output", default="Connections.csv", help="output file (default: Connections.csv)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--encoding", choices=ENCODINGS, default="utf-8",
+                        help="file encoding (default: utf-8)")
+    args = parser.parse_args(argv)
+
+    data = synthetic_export(args.rows, seed=args.seed, encoding=args.encoding)
+    with open(args.output, 'wb') as output:
+        output.write(data)
+    print(f"Wrote {args.rows} connections ({len(data) / 1e6:.1f} MB) to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())